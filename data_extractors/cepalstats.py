@@ -1,6 +1,20 @@
+import fnmatch
+import hashlib
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
 import requests
-from typing import Optional, Dict, Union, List
-from dataclasses import dataclass
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from typing import Optional, Dict, Union, List, Iterable, Iterator
+from dataclasses import dataclass, field
 from enum import Enum
 
 
@@ -17,11 +31,204 @@ class Format(str, Enum):
     EXCEL = "excel"
 
 
+# Seconds a cached response is served without contacting the API, by endpoint pattern.
+# The first matching pattern wins; 0 disables caching for that endpoint.
+DEFAULT_CACHE_TTLS = {
+    "*/thematic-tree": 7 * 24 * 3600,
+    "*/metadata": 7 * 24 * 3600,
+    "*/dimensions": 7 * 24 * 3600,
+    "*/footnotes": 7 * 24 * 3600,
+    "*/sources": 7 * 24 * 3600,
+    "*/publications": 7 * 24 * 3600,
+    "*/areas": 24 * 3600,
+    "*/records": 3600,
+    "*/data": 3600,
+    "*": 3600,
+}
+
+
 @dataclass
 class CepalstatConfig:
+    """
+    Configuration of the CEPALSTAT client and its HTTP transport.
+
+    Attributes:
+        base_url: Root URL of the API
+        language: Language of the responses
+        format: Format of the responses
+        timeout: Seconds to wait for each response
+        max_retries: Retries on connection errors and 429/5xx responses
+        backoff_factor: Base of the exponential backoff between retries, in seconds
+        pool_size: Number of keep-alive connections kept open
+        requests_per_second: Client-side rate limit; None disables it
+        cache_dir: Directory of the on-disk response cache; None keeps the cache in memory only
+        memory_cache_size: Number of responses kept in memory (least recently used are evicted)
+        disk_cache_size: Number of responses kept in `cache_dir` (least recently used are evicted); None keeps all
+        cache_ttls: Freshness in seconds of cached responses by endpoint pattern (fnmatch syntax)
+    """
     base_url: str = "https://api-cepalstat.cepal.org"
     language: Language = Language.ENGLISH
     format: Format = Format.JSON
+    timeout: float = 30.0
+    max_retries: int = 3
+    backoff_factor: float = 0.5
+    pool_size: int = 10
+    requests_per_second: Optional[float] = 50.0
+    cache_dir: Optional[str] = None
+    memory_cache_size: int = 256
+    disk_cache_size: Optional[int] = 4096
+    cache_ttls: Dict[str, float] = field(default_factory=lambda: dict(DEFAULT_CACHE_TTLS))
+
+
+class RateLimiter:
+    """
+    Thread-safe token bucket limiting the rate of outgoing requests.
+
+    Allows bursts of up to `burst` requests and then `rate` requests per second.
+    """
+
+    def __init__(self, rate: float, burst: Optional[int] = None):
+        self.rate = rate
+        self.capacity = burst or max(1, int(rate))
+        self._tokens = float(self.capacity)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self) -> None:
+        """
+        Block until a request may be sent.
+        """
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                wait = (1 - self._tokens) / self.rate
+            time.sleep(wait)
+
+
+class ResponseCache:
+    """
+    Two-level cache of API responses: an in-memory LRU in front of an optional directory of JSON files.
+
+    Entries are dictionaries with the response body, the time it was stored
+    and the ETag/Last-Modified validators used for conditional requests.
+    Both levels hold entries serialized as JSON, so every `get` returns a new
+    object and callers can modify it without corrupting the cache. Once the
+    directory holds more than `max_disk_entries` files, the least recently
+    used ones (by modification time, refreshed on every disk hit) are deleted
+    until it is back to 90% of the limit.
+    """
+
+    def __init__(self, max_entries: int = 256, cache_dir: Optional[str] = None,
+                 max_disk_entries: Optional[int] = None):
+        self.max_entries = max_entries
+        self.max_disk_entries = max_disk_entries
+        self.cache_dir = Path(cache_dir).expanduser() if cache_dir else None
+        if self.cache_dir:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self._memory: OrderedDict = OrderedDict()
+        self._lock = threading.Lock()
+        self._disk_lock = threading.Lock()
+        self._disk_entries = len(list(self.cache_dir.glob("*.json"))) if self.cache_dir else 0
+
+    @staticmethod
+    def key(url: str, params: Dict) -> str:
+        """
+        Build the cache key of a request from its URL and sorted query parameters.
+        """
+        request = json.dumps([url, sorted((str(k), str(v)) for k, v in params.items())])
+        return hashlib.sha256(request.encode()).hexdigest()
+
+    def get(self, key: str) -> Optional[Dict]:
+        with self._lock:
+            if key in self._memory:
+                self._memory.move_to_end(key)
+                return json.loads(self._memory[key])
+
+        if self.cache_dir:
+            path = self.cache_dir / f"{key}.json"
+            try:
+                serialized = path.read_text(encoding="utf-8")
+                entry = json.loads(serialized)
+                os.utime(path)
+            except (OSError, ValueError):
+                return None
+            self._remember(key, serialized)
+            return entry
+        return None
+
+    def set(self, key: str, entry: Dict) -> None:
+        serialized = json.dumps(entry)
+        self._remember(key, serialized)
+        if self.cache_dir:
+            # Atomic write, so concurrent readers never see a partial file
+            path = self.cache_dir / f"{key}.json"
+            is_new = not path.exists()
+            temp_path = path.with_name(f"{path.name}.{threading.get_ident()}.tmp")
+            temp_path.write_text(serialized, encoding="utf-8")
+            os.replace(temp_path, path)
+            if is_new:
+                self._evict_files()
+
+    def clear(self) -> None:
+        with self._lock:
+            self._memory.clear()
+        if self.cache_dir:
+            with self._disk_lock:
+                for path in self.cache_dir.glob("*.json"):
+                    path.unlink(missing_ok=True)
+                self._disk_entries = 0
+
+    def _remember(self, key: str, serialized: str) -> None:
+        with self._lock:
+            self._memory[key] = serialized
+            self._memory.move_to_end(key)
+            while len(self._memory) > self.max_entries:
+                self._memory.popitem(last=False)
+
+    def _evict_files(self) -> None:
+        """
+        Count a new file in the cache directory and delete the least recently used ones if it is full.
+        """
+        with self._disk_lock:
+            self._disk_entries += 1
+            if self.max_disk_entries is None or self._disk_entries <= self.max_disk_entries:
+                return
+            files = []
+            for path in self.cache_dir.glob("*.json"):
+                try:
+                    files.append((path.stat().st_mtime, path))
+                except OSError:
+                    continue
+            files.sort()
+            # Shrink below the limit, so the directory is not scanned again on the next write
+            excess = max(0, len(files) - int(self.max_disk_entries * 0.9))
+            for _, path in files[:excess]:
+                path.unlink(missing_ok=True)
+            self._disk_entries = len(files) - excess
+
+
+@dataclass
+class IndicatorResult:
+    """
+    Responses fetched for one indicator by `CepalstatAPI.fetch_indicators`.
+
+    Attributes:
+        indicator_id: ID of the indicator
+        data: API response of each part that succeeded, by part name
+        errors: Exception raised by each part that failed, by part name
+    """
+    indicator_id: int
+    data: Dict[str, Dict] = field(default_factory=dict)
+    errors: Dict[str, Exception] = field(default_factory=dict)
+
+    @property
+    def ok(self) -> bool:
+        return not self.errors
 
 
 class CepalstatAPI:
@@ -37,11 +244,58 @@ class CepalstatAPI:
             config: Optional configuration object. If not provided, defaults will be used.
         """
         self.config = config or CepalstatConfig()
+        self.session = self._create_session()
+        self.cache = ResponseCache(
+            self.config.memory_cache_size, self.config.cache_dir, self.config.disk_cache_size
+        )
+        self.rate_limiter = RateLimiter(self.config.requests_per_second) if self.config.requests_per_second else None
+        self._dimension_lookups: Dict[int, Dict[str, Dict]] = {}
+
+    def _create_session(self) -> requests.Session:
+        """
+        Create a keep-alive session that retries failed requests with exponential backoff.
+
+        Returns:
+            Session with a connection pool of `config.pool_size` connections
+        """
+        retry = Retry(
+            total=self.config.max_retries,
+            backoff_factor=self.config.backoff_factor,
+            status_forcelist=(429, 500, 502, 503, 504),
+            allowed_methods=("GET",),
+            respect_retry_after_header=True,
+        )
+        adapter = HTTPAdapter(
+            pool_connections=self.config.pool_size, pool_maxsize=self.config.pool_size, max_retries=retry
+        )
+        session = requests.Session()
+        session.mount("http://", adapter)
+        session.mount("https://", adapter)
+        return session
+
+    def _cache_ttl(self, endpoint: str) -> float:
+        """
+        Get the freshness in seconds of cached responses for an endpoint.
+        """
+        for pattern, ttl in self.config.cache_ttls.items():
+            if fnmatch.fnmatch(endpoint, pattern):
+                return ttl
+        return 0
+
+    def clear_cache(self) -> None:
+        """
+        Drop every cached response, in memory and on disk.
+        """
+        self.cache.clear()
 
     def _make_request(self, endpoint: str, params: Optional[Dict] = None) -> Dict:
         """
         Make a request to the CEPALSTAT API.
 
+        Responses are served from the cache while they are fresh. Stale
+        entries are revalidated with If-None-Match/If-Modified-Since, so an
+        unchanged resource costs a 304 response instead of a full download.
+
         Args:
             endpoint: API endpoint to call
             params: Optional query parameters
@@ -57,9 +311,36 @@ class CepalstatAPI:
         if params:
             default_params.update(params)
 
-        response = requests.get(url, params=default_params)
-        response.raise_for_status()
-        return response.json()
+        ttl = self._cache_ttl(endpoint)
+        key = ResponseCache.key(url, default_params)
+        entry = self.cache.get(key) if ttl > 0 else None
+        if entry is not None and time.time() - entry["stored_at"] < ttl:
+            return entry["body"]
+
+        headers = {}
+        if entry is not None:
+            if entry.get("etag"):
+                headers["If-None-Match"] = entry["etag"]
+            if entry.get("last_modified"):
+                headers["If-Modified-Since"] = entry["last_modified"]
+
+        if self.rate_limiter is not None:
+            self.rate_limiter.acquire()
+        response = self.session.get(url, params=default_params, headers=headers, timeout=self.config.timeout)
+
+        if response.status_code == 304 and entry is not None:
+            entry = {**entry, "stored_at": time.time()}
+        else:
+            response.raise_for_status()
+            entry = {
+                "body": response.json(),
+                "stored_at": time.time(),
+                "etag": response.headers.get("ETag"),
+                "last_modified": response.headers.get("Last-Modified"),
+            }
+        if ttl > 0:
+            self.cache.set(key, entry)
+        return entry["body"]
 
     def get_thematic_tree(self) -> Dict:
         """
@@ -200,6 +481,216 @@ class CepalstatAPI:
             params["members"] = ",".join(str(m) for m in members)
         return self._make_request(f"/cepalstat/api/v1/indicator/{indicator_id}/data", params)
 
+    @staticmethod
+    def _body(response: Union[Dict, List], *keys: str) -> Union[Dict, List]:
+        """
+        Get the payload of a response, whether or not it is wrapped in "body", under the first key present.
+        """
+        body = response.get("body", response) if isinstance(response, dict) else response
+        for key in keys:
+            if isinstance(body, dict) and key in body:
+                return body[key]
+        return body
+
+    @classmethod
+    def dimension_lookup(cls, dimensions: Dict) -> Dict[str, Dict]:
+        """
+        Build the label lookup of each dimension from a dimensions response.
+
+        Args:
+            dimensions: Response of `get_indicator_dimensions`
+
+        Returns:
+            Dictionary mapping each record column (`dim_<id>`) to the dimension
+            name and the member IDs and names
+        """
+        lookup = {}
+        for dimension in cls._body(dimensions, "dimensions") or []:
+            members = dimension.get("members") or []
+            lookup[f"dim_{dimension['id']}"] = {
+                "name": dimension.get("name") or f"dim_{dimension['id']}",
+                "ids": np.array([member["id"] for member in members], dtype=np.int64),
+                "names": [member.get("name") for member in members],
+            }
+        return lookup
+
+    def get_dimension_lookup(self, indicator_id: int) -> Dict[str, Dict]:
+        """
+        Get the dimension label lookup of an indicator, built once per client.
+
+        Args:
+            indicator_id: ID of the indicator
+
+        Returns:
+            Lookup as returned by `dimension_lookup`
+        """
+        if indicator_id not in self._dimension_lookups:
+            self._dimension_lookups[indicator_id] = self.dimension_lookup(self.get_indicator_dimensions(indicator_id))
+        return self._dimension_lookups[indicator_id]
+
+    @classmethod
+    def decode_records(cls, records: Dict, lookup: Dict[str, Dict], include_ids: bool = False) -> pd.DataFrame:
+        """
+        Decode indicator records into a typed DataFrame.
+
+        Records are loaded column by column; each `dim_<id>` column becomes a
+        categorical column named after its dimension, with member IDs
+        translated to labels in one vectorized lookup. Values are float64 and
+        the remaining text columns are categorical.
+
+        Args:
+            records: Response of `get_indicator_records` or `get_indicator_data`
+            lookup: Dimension lookup from `dimension_lookup`
+            include_ids: If True, keeps the member IDs as `<dimension>_id` columns
+
+        Returns:
+            DataFrame with one row per record
+        """
+        frame = pd.DataFrame.from_records(cls._body(records, "data", "records") or [])
+        decoded = {}
+        for column in frame.columns:
+            values = frame[column]
+            if column in lookup:
+                dimension = lookup[column]
+                ids = pd.to_numeric(values, errors="coerce").astype("Int64")
+                positions = pd.Index(dimension["ids"]).get_indexer(ids.fillna(-1).astype(np.int64))
+                labels = pd.Index(dimension["names"])
+                # Unknown members get code -1 (missing); repeated names share a category
+                codes, categories = pd.factorize(labels)
+                member_codes = np.full(len(positions), -1, dtype=np.int64)
+                if len(codes):
+                    member_codes = np.where(positions >= 0, codes[np.where(positions >= 0, positions, 0)], -1)
+                decoded[dimension["name"]] = pd.Categorical.from_codes(member_codes, categories=categories)
+                if include_ids:
+                    decoded[f"{dimension['name']}_id"] = ids
+            elif column == "value":
+                decoded[column] = pd.to_numeric(values, errors="coerce").astype(np.float64)
+            elif pd.api.types.is_string_dtype(values) or (
+                    values.dtype == object and values.map(pd.api.types.is_hashable).all()
+            ):
+                # List-valued fields (e.g. arrays of note IDs) cannot be categories and stay as objects
+                decoded[column] = values.astype("category")
+            else:
+                decoded[column] = values
+        return pd.DataFrame(decoded, index=pd.RangeIndex(len(frame)))
+
+    def get_indicator_frame(
+            self,
+            indicator_id: int,
+            members: Optional[List[Union[int, str]]] = None,
+            include_ids: bool = False,
+            parquet_dir: Optional[str] = None,
+            refresh: bool = False
+    ) -> pd.DataFrame:
+        """
+        Get the records of an indicator as a typed DataFrame with dimension labels.
+
+        With `parquet_dir`, the decoded table is written to Parquet and later
+        calls read it back without contacting the API or parsing JSON.
+
+        Args:
+            indicator_id: ID of the indicator
+            members: Optional list of dimension members to filter by
+            include_ids: If True, keeps the member IDs next to the labels
+            parquet_dir: Optional directory of decoded indicators
+            refresh: If True, ignores the Parquet file and decodes the records again
+
+        Returns:
+            DataFrame as returned by `decode_records`
+        """
+        path = None
+        if parquet_dir is not None:
+            suffix = "_".join(str(m) for m in members) if members else "all"
+            path = Path(parquet_dir).expanduser() / (
+                f"indicator_{indicator_id}_{self.config.language.value}_{suffix}{'_ids' if include_ids else ''}.parquet"
+            )
+            if path.exists() and not refresh:
+                return pd.read_parquet(path)
+
+        frame = self.decode_records(
+            self.get_indicator_records(indicator_id, members), self.get_dimension_lookup(indicator_id), include_ids
+        )
+        if path is not None:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            frame.to_parquet(path, index=False)
+        return frame
+
+    # Parts that `fetch_indicators` can request, by name
+    INDICATOR_PARTS = {
+        "metadata": "get_indicator_metadata",
+        "dimensions": "get_indicator_dimensions",
+        "records": "get_indicator_records",
+        "data": "get_indicator_data",
+        "footnotes": "get_indicator_footnotes",
+        "sources": "get_indicator_sources",
+        "areas": "get_indicator_areas",
+        "publications": "get_indicator_publications",
+    }
+
+    def fetch_indicators(
+            self,
+            indicator_ids: Iterable[int],
+            parts: Iterable[str] = ("metadata", "dimensions", "records"),
+            max_workers: int = 8
+    ) -> Iterator[IndicatorResult]:
+        """
+        Fetch several parts of many indicators concurrently.
+
+        Every (indicator, part) request runs on a pool of `max_workers`
+        threads that share the client's session, cache and rate limiter. An
+        indicator is yielded as soon as all its parts are done, so results
+        arrive in completion order. A failing request is recorded in the
+        result's `errors` and does not stop the batch.
+
+        Requests that reach the network also pass through the client's rate
+        limiter, so throughput is at most `config.requests_per_second`
+        whatever `max_workers` is (600 uncached requests take at least 12 s
+        with the default of 50). Fresh cache hits skip the limiter. Raise the
+        limit, or set it to None, in the config for larger batches.
+
+        Args:
+            indicator_ids: IDs of the indicators
+            parts: Names of the parts to fetch, keys of `INDICATOR_PARTS`
+            max_workers: Maximum number of concurrent requests; keep it at or
+                below `config.pool_size` so every worker reuses a pooled connection.
+                The effective rate is also capped by `config.requests_per_second`
+
+        Returns:
+            Iterator of IndicatorResult, one per distinct indicator ID
+        """
+        parts = list(parts)
+        unknown = [part for part in parts if part not in self.INDICATOR_PARTS]
+        if unknown:
+            raise ValueError(f"Unknown indicator parts {unknown}, expected some of {list(self.INDICATOR_PARTS)}")
+        return self._iter_indicators(indicator_ids, parts, max_workers)
+
+    def _iter_indicators(self, indicator_ids: Iterable[int], parts: List[str], max_workers: int):
+        """
+        Run the requests of `fetch_indicators` and yield each indicator once all its parts are done.
+        """
+        results = {indicator_id: IndicatorResult(indicator_id) for indicator_id in indicator_ids}
+        pending = {indicator_id: len(parts) for indicator_id in results}
+        executor = ThreadPoolExecutor(max_workers=max_workers)
+        try:
+            futures = {
+                executor.submit(getattr(self, self.INDICATOR_PARTS[part]), indicator_id): (indicator_id, part)
+                for indicator_id in results
+                for part in parts
+            }
+            for future in as_completed(futures):
+                indicator_id, part = futures[future]
+                try:
+                    results[indicator_id].data[part] = future.result()
+                except (requests.RequestException, ValueError) as error:
+                    results[indicator_id].errors[part] = error
+
+                pending[indicator_id] -= 1
+                if not pending[indicator_id]:
+                    yield results.pop(indicator_id)
+        finally:
+            # Drop the queued requests if the caller stops iterating early
+            executor.shutdown(wait=True, cancel_futures=True)
+
 
 if __name__ == "__main__":
     cepalstat_api = CepalstatAPI()
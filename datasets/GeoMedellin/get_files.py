@@ -1,13 +1,26 @@
+import geopandas as gpd
 import pandas as pd
+import pyogrio.errors
 import requests
 import os
+import json
+import hashlib
+import tempfile
+import threading
+import time
 import zipfile
 import logging
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
 from enum import Enum
+from requests.adapters import HTTPAdapter
 from tqdm import tqdm
 
 
+CHUNK_SIZE = 1024 * 1024  # 1 MB por escritura
+SPOOL_MAX_SIZE = 64 * 1024 * 1024  # Archivos más grandes pasan del buffer en memoria a disco
+
+
 class DataFormat(Enum):
     GEOPACKAGE = 'link_GeoPackage'
     GEODATABASE = 'link_FileGeodatabase'
@@ -17,52 +30,507 @@ class DataFormat(Enum):
     KMZ = 'link_KMZ'
 
 
-def download_and_extract(url: str, output_dir: Path) -> None:
+# Extensiones de los miembros del zip que corresponden a cada formato
+FORMAT_EXTENSIONS = {
+    DataFormat.GEOPACKAGE: ('.gpkg',),
+    DataFormat.GEODATABASE: ('.gdb',),
+    DataFormat.GEOJSON: ('.geojson', '.json'),
+    DataFormat.CSV: ('.csv',),
+    DataFormat.SHAPEFILE: ('.shp', '.shx', '.dbf', '.prj', '.cpg', '.sbn', '.sbx', '.qix'),
+    DataFormat.KMZ: ('.kmz', '.kml'),
+}
+# Formatos de un solo archivo, que se pueden leer directamente desde el zip
+SINGLE_FILE_EXTENSIONS = ('.gpkg', '.geojson', '.json', '.kml')
+
+
+class DownloadManifest:
+    """
+    Registro local de los archivos descargados, guardado como JSON.
+
+    Por cada URL guarda el ETag, el Last-Modified y el tamaño de la última
+    descarga completa y lo que produjo en disco, para omitir los archivos que
+    no han cambiado en el servidor y cuya salida sigue presente. Es seguro
+    usarlo desde varios hilos.
+
+    Args:
+        path (Path): Ruta del archivo JSON del manifiesto
+    """
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self._lock = threading.Lock()
+        self.entries = json.loads(self.path.read_text(encoding='utf-8')) if self.path.exists() else {}
+
+    def get(self, url: str) -> dict:
+        with self._lock:
+            return dict(self.entries.get(url, {}))
+
+    def update(self, url: str, **fields) -> None:
+        """Actualiza la entrada de una URL y guarda el manifiesto en disco."""
+        with self._lock:
+            self.entries.setdefault(url, {}).update(fields)
+            # Escritura atómica para no dejar un manifiesto corrupto si se interrumpe
+            temp_path = self.path.with_name(self.path.name + '.tmp')
+            temp_path.write_text(json.dumps(self.entries, indent=2, ensure_ascii=False), encoding='utf-8')
+            os.replace(temp_path, self.path)
+
+
+def create_session(pool_size: int = 8, retries: int = 3) -> requests.Session:
+    """
+    Crea una sesión HTTP que reutiliza conexiones entre descargas.
+
+    Args:
+        pool_size (int): Número máximo de conexiones abiertas por host
+        retries (int): Reintentos ante errores de conexión
+
+    Returns:
+        requests.Session: Sesión con un pool de conexiones del tamaño indicado
+    """
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=retries)
+    session.mount('http://', adapter)
+    session.mount('https://', adapter)
+    return session
+
+
+def _validators(headers) -> dict:
+    """Extrae de los encabezados los campos que identifican una versión del archivo."""
+    size = headers.get('content-length')
+    return {
+        'etag': headers.get('etag'),
+        'last_modified': headers.get('last-modified'),
+        'size': int(size) if size is not None else None,
+    }
+
+
+def _conditional_headers(entry: dict) -> dict:
+    """Encabezados para que el servidor responda 304 si el archivo no cambió."""
+    headers = {}
+    if entry.get('complete'):
+        if entry.get('etag'):
+            headers['If-None-Match'] = entry['etag']
+        if entry.get('last_modified'):
+            headers['If-Modified-Since'] = entry['last_modified']
+    return headers
+
+
+def _output_present(entry: dict) -> bool:
+    """Indica si lo que produjo la última descarga (archivo o archivos extraídos) sigue en disco."""
+    if not entry.get('path'):
+        return False
+    if 'files' in entry:
+        return all(Path(entry['path'], name).exists() for name in entry['files'])
+    return Path(entry['path']).exists()
+
+
+def _output_mode(data_format: DataFormat = None, to_parquet: bool = False) -> dict:
+    """Campos del manifiesto que describen cómo se guardó una descarga (formato extraído y parquet)."""
+    return {
+        'data_format': data_format.name if data_format is not None else None,
+        'to_parquet': bool(to_parquet and data_format is not None),
+    }
+
+
+def _manifest_entry(manifest: DownloadManifest, url: str, data_format: DataFormat = None,
+                    to_parquet: bool = False) -> dict:
+    """
+    Entrada del manifiesto para una URL, marcada como incompleta si su salida ya no sirve.
+
+    Así un archivo borrado a mano, o guardado en otro modo (otro formato o
+    sin convertir a parquet), se vuelve a descargar aunque no haya cambiado
+    en el servidor.
+    """
+    entry = manifest.get(url) if manifest is not None else {}
+    if not entry.get('complete'):
+        return entry
+    if not _output_present(entry):
+        logging.info(f"La salida de {url} ya no existe, se descarga de nuevo")
+        entry['complete'] = False
+    elif any(entry.get(field) != value for field, value in _output_mode(data_format, to_parquet).items()):
+        logging.info(f"{url} se descargó en otro modo, se descarga de nuevo")
+        entry['complete'] = False
+    return entry
+
+
+def _is_unchanged(entry: dict, validators: dict) -> bool:
+    """Indica si la versión del servidor coincide con la última descarga completa."""
+    if not entry.get('complete'):
+        return False
+    known = [field for field in ('etag', 'last_modified') if entry.get(field) and validators.get(field)]
+    if not known:
+        return False
+    if any(entry[field] != validators[field] for field in known):
+        return False
+    return validators.get('size') is None or entry.get('size') == validators['size']
+
+
+def download_file(url: str, destination: Path, session: requests.Session = None,
+                  manifest: DownloadManifest = None, progress: tqdm = None) -> tuple[bool, int]:
+    """
+    Descarga un archivo a disco, reanudando descargas parciales.
+
+    El contenido se escribe en `<destino>.part` y se renombra al terminar.
+    Si existe un `.part` previo, se pide solo el resto con un encabezado
+    Range (y If-Range para no mezclar versiones distintas). Con un
+    manifiesto, los archivos cuyo ETag/Last-Modified/tamaño no cambió se
+    omiten sin descargar el contenido.
+
+    Args:
+        url (str): URL del archivo
+        destination (Path): Ruta final del archivo descargado
+        session (requests.Session, opcional): Sesión HTTP a reutilizar
+        manifest (DownloadManifest, opcional): Manifiesto de descargas previas
+        progress (tqdm, opcional): Barra de progreso a actualizar con los bytes recibidos
+
+    Returns:
+        tuple[bool, int]: Si el archivo se descargó (False si se omitió) y el número de bytes recibidos
+    """
+    session = session or requests
+    entry = _manifest_entry(manifest, url)
+    part_path = destination.with_name(destination.name + '.part')
+
+    headers = _conditional_headers(entry)
+    offset = part_path.stat().st_size if part_path.exists() else 0
+    if offset:
+        headers['Range'] = f'bytes={offset}-'
+        if entry.get('etag') or entry.get('last_modified'):
+            headers['If-Range'] = entry.get('etag') or entry['last_modified']
+
+    with session.get(url, headers=headers, stream=True, timeout=60) as response:
+        if response.status_code == 304:
+            logging.info(f"Sin cambios, se omite {url}")
+            return False, 0
+        if response.status_code == 416 and offset:
+            # El rango pedido empieza al final: el .part puede estar completo
+            total = response.headers.get('content-range', '').rsplit('/', 1)[-1]
+            size = int(total) if total.isdigit() else entry.get('size')
+            if size == offset:
+                os.replace(part_path, destination)
+                if manifest is not None:
+                    manifest.update(url, complete=True, size=size, path=str(destination.parent),
+                                    files=[destination.name])
+                return True, 0
+            # El .part no corresponde al archivo del servidor: se descarta y se empieza de cero
+            logging.info(f"Descarga parcial inválida, se reinicia {url}")
+            part_path.unlink()
+            return download_file(url, destination, session, manifest, progress)
+        response.raise_for_status()
+
+        validators = _validators(response.headers)
+        if response.status_code == 206:
+            validators['size'] = int(response.headers['content-range'].rsplit('/', 1)[-1])
+        else:
+            # El servidor no aceptó el rango o el archivo cambió: se empieza de cero
+            offset = 0
+        if response.status_code != 206 and _is_unchanged(entry, validators):
+            logging.info(f"Sin cambios, se omite {url}")
+            return False, 0
+
+        if manifest is not None:
+            manifest.update(url, complete=False, **validators)
+
+        received = 0
+        with open(part_path, 'ab' if offset else 'wb') as f:
+            for data in response.iter_content(chunk_size=CHUNK_SIZE):
+                f.write(data)
+                received += len(data)
+                if progress is not None:
+                    progress.update(len(data))
+
+    os.replace(part_path, destination)
+    if manifest is not None:
+        manifest.update(url, complete=True, path=str(destination.parent), files=[destination.name])
+    return True, received
+
+
+def _archive_path(url: str, output_dir: Path) -> Path:
+    """Nombre propio por URL para que las descargas simultáneas no compartan archivo."""
+    name = url.rstrip('/').split('/')[-1] or 'archivo'
+    return output_dir / f"{hashlib.sha1(url.encode()).hexdigest()[:10]}_{name}"
+
+
+def extract_archive(zip_path: Path, output_dir: Path) -> list[str]:
+    """
+    Extrae un archivo zip y lo elimina.
+
+    Args:
+        zip_path (Path): Ruta del archivo zip
+        output_dir (Path): Directorio donde se extraerá el contenido
+
+    Returns:
+        list[str]: Archivos extraídos, relativos a `output_dir`
+    """
+    logging.info(f"Extrayendo archivo en {output_dir}")
+    with zipfile.ZipFile(zip_path, 'r') as zip_ref:
+        zip_ref.extractall(output_dir)
+        files = [member for member in zip_ref.namelist() if not member.endswith('/')]
+    os.remove(zip_path)
+    logging.info("Extracción completada")
+    return files
+
+
+def _matches_format(member: str, data_format: DataFormat) -> bool:
+    """Indica si un miembro del zip pertenece al formato pedido (incluye el contenido de carpetas .gdb)."""
+    name = member.lower()
+    if data_format == DataFormat.GEODATABASE:
+        return any(part.endswith('.gdb') for part in Path(name).parts)
+    return name.endswith(FORMAT_EXTENSIONS[data_format])
+
+
+def _is_geojson(zip_ref: zipfile.ZipFile, member: str) -> bool:
+    """Revisa el inicio de un .json para distinguir GeoJSON de otros JSON (p. ej. metadatos)."""
+    if not member.lower().endswith('.json'):
+        return True
+    with zip_ref.open(member) as f:
+        head = f.read(64 * 1024)
+    return b'"FeatureCollection"' in head or b'"Feature"' in head
+
+
+def _write_parquet(zip_ref: zipfile.ZipFile, members: list[str], output_dir: Path) -> list[Path]:
+    """
+    Convierte a parquet las capas de los miembros seleccionados.
+
+    Los formatos de un solo archivo se leen directamente del zip; los que
+    necesitan archivos auxiliares (shapefile, geodatabase) se extraen a un
+    directorio temporal para leerlos. Los miembros que no se pueden
+    convertir (CSV, KMZ, JSON que no son GeoJSON o capas ilegibles) se
+    extraen tal cual, para no perder datos.
+
+    Returns:
+        list[Path]: Archivos escritos en `output_dir`, parquet y extraídos
+    """
+    written = []
+    converted = set()
+
+    def convert(source, target: Path, sources: list[str]) -> None:
+        try:
+            geodata = gpd.read_file(source)
+        except (pyogrio.errors.DataSourceError, pyogrio.errors.DataLayerError, ValueError) as error:
+            logging.warning(f"No se pudo convertir {sources[0]} a parquet: {error}")
+            return
+        geodata.to_parquet(target)
+        written.append(target)
+        converted.update(sources)
+
+    single_file = [
+        member for member in members
+        if member.lower().endswith(SINGLE_FILE_EXTENSIONS) and _is_geojson(zip_ref, member)
+    ]
+    for member in single_file:
+        with zip_ref.open(member) as f:
+            convert(f, output_dir / f"{Path(member).stem}.parquet", [member])
+
+    multi_file = [member for member in members if member not in single_file]
+    shapefiles = [member for member in multi_file if member.lower().endswith('.shp')]
+    geodatabases = sorted({
+        Path(*Path(member).parts[:index + 1]).as_posix()
+        for member in multi_file
+        for index, part in enumerate(Path(member).parts) if part.lower().endswith('.gdb')
+    })
+    if shapefiles or geodatabases:
+        with tempfile.TemporaryDirectory() as temp_dir:
+            zip_ref.extractall(temp_dir, members=multi_file)
+            for shapefile in shapefiles:
+                # El shapefile incluye los archivos auxiliares con el mismo nombre
+                stem = shapefile[:-len('.shp')]
+                sidecars = [member for member in multi_file if member.rsplit('.', 1)[0] == stem]
+                convert(Path(temp_dir, shapefile), output_dir / f"{Path(shapefile).stem}.parquet", sidecars)
+            for geodatabase in geodatabases:
+                contents = [member for member in multi_file if member.startswith(geodatabase + '/')]
+                convert(Path(temp_dir, geodatabase), output_dir / f"{Path(geodatabase).stem}.parquet", contents)
+
+    leftovers = [member for member in members if member not in converted]
+    if leftovers:
+        logging.info(f"Extrayendo {len(leftovers)} archivos que no se convierten a parquet en {output_dir}")
+        zip_ref.extractall(output_dir, members=leftovers)
+        written.extend(output_dir / member for member in leftovers)
+    return written
+
+
+def stream_extract(url: str, output_dir: Path, data_format: DataFormat, session: requests.Session = None,
+                   manifest: DownloadManifest = None, progress: tqdm = None, to_parquet: bool = False) -> int:
+    """
+    Descarga un zip a un buffer y extrae solo los archivos del formato pedido.
+
+    El contenido se guarda en un SpooledTemporaryFile, que se mantiene en
+    memoria hasta SPOOL_MAX_SIZE bytes, así que el zip no se escribe como
+    archivo temporal. Con `to_parquet`, las capas se convierten a GeoParquet
+    y solo se escribe un archivo .parquet por capa.
+
+    Args:
+        url (str): URL del archivo zip a descargar
+        output_dir (Path): Directorio donde se guardará el contenido
+        data_format (DataFormat): Formato cuyos archivos se extraen
+        session (requests.Session, opcional): Sesión HTTP a reutilizar
+        manifest (DownloadManifest, opcional): Manifiesto para omitir archivos sin cambios
+        progress (tqdm, opcional): Barra de progreso compartida
+        to_parquet (bool, opcional): Convierte las capas a parquet en lugar de extraerlas
+
+    Returns:
+        int: Número de bytes descargados, o None si se omitió
+    """
+    session = session or requests
+    entry = _manifest_entry(manifest, url, data_format, to_parquet)
+
+    with session.get(url, headers=_conditional_headers(entry), stream=True, timeout=60) as response, \
+            tempfile.SpooledTemporaryFile(max_size=SPOOL_MAX_SIZE) as buffer:
+        if response.status_code == 304:
+            logging.info(f"Sin cambios, se omite {url}")
+            return None
+        response.raise_for_status()
+        validators = _validators(response.headers)
+        if _is_unchanged(entry, validators):
+            logging.info(f"Sin cambios, se omite {url}")
+            return None
+
+        received = 0
+        for data in response.iter_content(chunk_size=CHUNK_SIZE):
+            buffer.write(data)
+            received += len(data)
+            if progress is not None:
+                progress.update(len(data))
+
+        buffer.seek(0)
+        with zipfile.ZipFile(buffer) as zip_ref:
+            members = [
+                member for member in zip_ref.namelist()
+                if not member.endswith('/') and _matches_format(member, data_format)
+            ]
+            logging.info(f"Extrayendo {len(members)} archivos {data_format.name} en {output_dir}")
+            if to_parquet:
+                written = _write_parquet(zip_ref, members, output_dir)
+                files = [path.relative_to(output_dir).as_posix() for path in written]
+            else:
+                zip_ref.extractall(output_dir, members=members)
+                files = members
+
+    if manifest is not None:
+        manifest.update(url, complete=True, path=str(output_dir), files=files, **validators,
+                        **_output_mode(data_format, to_parquet))
+    return received
+
+
+def download_and_extract(url: str, output_dir: Path, session: requests.Session = None,
+                         manifest: DownloadManifest = None, progress: tqdm = None,
+                         data_format: DataFormat = None, to_parquet: bool = False) -> int:
     """
     Descarga y extrae un archivo zip de una URL dada.
 
+    Con `data_format`, el zip se procesa en memoria y solo se extraen (o
+    convierten a parquet) los archivos de ese formato; ver `stream_extract`.
+
     Args:
         url (str): URL del archivo zip a descargar
         output_dir (Path): Directorio donde se extraerá el contenido
+        session (requests.Session, opcional): Sesión HTTP a reutilizar
+        manifest (DownloadManifest, opcional): Manifiesto para omitir archivos sin cambios
+        progress (tqdm, opcional): Barra de progreso compartida
+        data_format (DataFormat, opcional): Formato a extraer en modo streaming
+        to_parquet (bool, opcional): Convierte las capas a parquet (requiere `data_format`)
 
     Returns:
-        None
+        int: Número de bytes descargados, o None si se omitió
     """
-    if not url.endswith('/'):
-        response = requests.get(url, stream=True)
-        if response.status_code == 200:
-            total_size = int(response.headers.get('content-length', 0))
-            zip_path = output_dir / "temp.zip"
+    if url.endswith('/'):
+        return None
+    if data_format is not None:
+        return stream_extract(url, output_dir, data_format, session, manifest, progress, to_parquet)
 
-            with open(zip_path, 'wb') as f, tqdm(
-                desc=f"Descargando {url.split('/')[-1]}",
-                total=total_size,
-                unit='B',
-                unit_scale=True,
-                unit_divisor=1024,
-            ) as pbar:
-                for data in response.iter_content(chunk_size=1024):
-                    size = f.write(data)
-                    pbar.update(size)
+    zip_path = _archive_path(url, output_dir)
+    if progress is None:
+        with tqdm(desc=f"Descargando {url.split('/')[-1]}", unit='B', unit_scale=True,
+                  unit_divisor=1024) as pbar:
+            downloaded, received = download_file(url, zip_path, session, manifest, pbar)
+    else:
+        downloaded, received = download_file(url, zip_path, session, manifest, progress)
 
-            logging.info(f"Extrayendo archivo en {output_dir}")
-            with zipfile.ZipFile(zip_path, 'r') as zip_ref:
-                zip_ref.extractall(output_dir)
+    # Un zip sin cambios que sigue en disco quedó sin extraer en una ejecución interrumpida
+    if not downloaded and not zip_path.exists():
+        return None
+    files = extract_archive(zip_path, output_dir)
+    if manifest is not None:
+        # El zip se borra tras extraerlo: lo que debe seguir existiendo son los archivos extraídos
+        manifest.update(url, path=str(output_dir), files=files, **_output_mode())
+    return received
 
-            os.remove(zip_path)
-            logging.info("Extracción completada")
 
+def download_all(tasks: list[tuple], max_workers: int = 8, manifest_path: Path = None,
+                 session: requests.Session = None, stream: bool = False, to_parquet: bool = False) -> dict:
+    """
+    Descarga y extrae varios archivos en paralelo con un número acotado de hilos.
+
+    Args:
+        tasks (list[tuple]): Tuplas (URL, directorio de salida, DataFormat)
+        max_workers (int): Número máximo de descargas simultáneas
+        manifest_path (Path, opcional): Ruta del manifiesto de descargas
+        session (requests.Session, opcional): Sesión HTTP compartida;
+            por defecto se crea una con un pool de `max_workers` conexiones
+        stream (bool, opcional): Procesa los zip en memoria y extrae solo el formato de cada tarea
+        to_parquet (bool, opcional): En modo streaming, convierte las capas a parquet
 
-def process_geodata(formats: list[DataFormat] = [DataFormat.GEOJSON]):
+    Returns:
+        dict: Resumen con archivos descargados, omitidos y fallidos, bytes,
+            segundos transcurridos y throughput en MB/s
+    """
+    session = session or create_session(pool_size=max_workers)
+    manifest = DownloadManifest(manifest_path) if manifest_path is not None else None
+    summary = {'downloaded': 0, 'skipped': 0, 'failed': 0, 'bytes': 0}
+
+    start = time.perf_counter()
+    with tqdm(desc="Descargando", unit='B', unit_scale=True, unit_divisor=1024) as progress, \
+            ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = {
+            executor.submit(
+                download_and_extract, url, output_dir, session, manifest, progress,
+                data_format if stream else None, to_parquet,
+            ): url
+            for url, output_dir, data_format in tasks
+        }
+        for future in as_completed(futures):
+            try:
+                received = future.result()
+            except (requests.RequestException, zipfile.BadZipFile, OSError, ValueError,
+                    pyogrio.errors.DataSourceError, pyogrio.errors.DataLayerError) as error:
+                logging.error(f"Error descargando {futures[future]}: {error}")
+                summary['failed'] += 1
+                continue
+            if received is None:
+                summary['skipped'] += 1
+            else:
+                summary['downloaded'] += 1
+                summary['bytes'] += received
+
+    summary['seconds'] = time.perf_counter() - start
+    summary['mb_per_second'] = summary['bytes'] / 1024 ** 2 / summary['seconds'] if summary['seconds'] else 0.0
+    logging.info(
+        f"Descargados {summary['downloaded']} archivos ({summary['bytes'] / 1024 ** 2:.1f} MB) "
+        f"en {summary['seconds']:.1f} s, {summary['mb_per_second']:.2f} MB/s; "
+        f"{summary['skipped']} sin cambios, {summary['failed']} con error"
+    )
+    return summary
+
+
+def process_geodata(formats: list[DataFormat] = [DataFormat.GEOJSON], max_workers: int = 8,
+                    catalog_path: str = 'datasets/GeoMedellin/medellin_geodata_filtered.csv',
+                    base_dir: str = 'datasets/GeoMedellin/data', stream: bool = False, to_parquet: bool = False):
     """
     Procesa y descarga datos geográficos desde un archivo CSV fuente.
 
+    Las descargas se hacen en paralelo y se registran en `manifest.json`
+    dentro de `base_dir`, de modo que una nueva ejecución solo descarga los
+    archivos que cambiaron y reanuda los que quedaron a medias.
+
     Args:
         formats (list[DataFormat], opcional): Lista de formatos a descargar.
             Por defecto descarga solo GeoJSON.
+        max_workers (int, opcional): Número máximo de descargas simultáneas
+        catalog_path (str, opcional): CSV con los enlaces de descarga
+        base_dir (str, opcional): Directorio raíz de los datos descargados
+        stream (bool, opcional): Extrae en memoria solo los archivos de cada formato
+        to_parquet (bool, opcional): En modo streaming, guarda cada capa como parquet
 
     Returns:
-        None
+        dict: Resumen de la descarga (ver `download_all`)
 
     Ejemplo:
         >>> process_geodata([DataFormat.GEOJSON, DataFormat.CSV])
@@ -73,24 +541,30 @@ def process_geodata(formats: list[DataFormat] = [DataFormat.GEOJSON]):
     )
 
     logging.info("Iniciando proceso de descarga de datos")
-    df = pd.read_csv('datasets/GeoMedellin/medellin_geodata_filtered.csv')
-    base_dir = Path('datasets/GeoMedellin/data')
+    df = pd.read_csv(catalog_path)
+    base_dir = Path(base_dir)
+    base_dir.mkdir(parents=True, exist_ok=True)
 
     # FIlter if needed
 
-    for _, row in tqdm(list(df.iterrows()), desc="Procesando datasets"):
+    tasks = []
+    for _, row in df.iterrows():
         theme_dir = base_dir / row['nombre_tematica'].replace(' ', '_')
-        theme_dir.mkdir(parents=True, exist_ok=True)
 
         for format_type in formats:
             url = row[format_type.value]
             if pd.notna(url):
                 format_dir = theme_dir / format_type.name.lower()
-                format_dir.mkdir(exist_ok=True)
-                logging.info(f"Procesando {row['nombre']} en formato {format_type.name}")
-                download_and_extract(url, format_dir)
+                format_dir.mkdir(parents=True, exist_ok=True)
+                tasks.append((url, format_dir, format_type))
+
+    logging.info(f"Procesando {len(tasks)} archivos con {max_workers} descargas simultáneas")
+    summary = download_all(
+        tasks, max_workers=max_workers, manifest_path=base_dir / 'manifest.json', stream=stream, to_parquet=to_parquet
+    )
 
     logging.info("Proceso completado exitosamente")
+    return summary
 
 
 if __name__ == "__main__":
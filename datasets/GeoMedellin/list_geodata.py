@@ -1,10 +1,39 @@
 import requests
 import pandas as pd
+import numpy as np
 import math
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from requests.adapters import HTTPAdapter
+
+
+BASE_URL = "https://www.medellin.gov.co/apigeomedellin/geomed/buscador"
+FORMATS_BASE_URL = "https://www.medellin.gov.co/apigeomedellin/atributos/archivos/openDataExt/"
+FILTROS = 'W3siVGlwbyI6W119LHsiVGVtYXRpY2FzIjpbbnVsbF19LHsiT3JkZW4iOlsyXX0seyJSZWNpZW50ZSI6WzFdfSx7IkZvcm1hdG9zIjpbXX0seyJDYXRlZ29yaWEiOltdfSx7IkZlY2hhcyI6W119XQ=='
+
+SELECTED_COLUMNS = [
+    'id_fuente_dato',
+    'id_tipo_fuente',
+    'metadato_privado',
+    'fecha_publicacion',
+    'fecha_actualizacion',
+    'id_tipo_licencia',
+    'id_termino_condiciones',
+    'nombre',
+    'descripcion',
+    'formatos',
+    'nombre_tematica',
+    'dependencia',
+    'id_metadata'
+]
+FORMAT_TYPES = ['GeoPackage', 'FileGeodatabase', 'GeoJson', 'CSV', 'ShapeFile', 'KMZ']
+
+# Keys the API may use for the total number of records, tried in order
+TOTAL_KEYS = ['total', 'totalRecords', 'total_records', 'recordsTotal', 'count', 'cantidad']
 
 
 def process_formats(formats_str):
-    base_url = "https://www.medellin.gov.co/apigeomedellin/atributos/archivos/openDataExt/"
+    base_url = FORMATS_BASE_URL
     formats_list = formats_str.split('--/') if formats_str else []
     processed_formats = {}
 
@@ -18,74 +47,122 @@ def process_formats(formats_str):
     return processed_formats
 
 
-def fetch_geomedellin_data():
-    base_url = "https://www.medellin.gov.co/apigeomedellin/geomed/buscador"
-    records_per_page = 50
-    all_data = []
-
-    total_records = 1005
-    total_pages = math.ceil(total_records / records_per_page)
-
-    for page in range(total_pages):
-        min_record = page * records_per_page
-        params = {
-            'comp': 2,
-            'page': page + 1,
-            'min': min_record,
-            'max': records_per_page,
-            'element': '',
-            'filtros': 'W3siVGlwbyI6W119LHsiVGVtYXRpY2FzIjpbbnVsbF19LHsiT3JkZW4iOlsyXX0seyJSZWNpZW50ZSI6WzFdfSx7IkZvcm1hdG9zIjpbXX0seyJDYXRlZ29yaWEiOltdfSx7IkZlY2hhcyI6W119XQ==',
-            'texto': '',
-            'superAdmin': 'false'
-        }
-
-        response = requests.get(base_url, params=params)
-
-        if response.status_code == 200:
-            data = response.json()
-            all_data.extend(data['data'])
-            print(f"Fetched page {page + 1}/{total_pages}")
+def format_links(formatos):
+    # Vectorized version of process_formats: one row per format item, then one column per format type
+    items = formatos.fillna('').str.split('--/').explode()
+    parts = items.str.split('--', expand=True).reindex(columns=range(4))
+    parts = parts[parts[3].notna()].astype(str)
+
+    if len(parts):
+        links = (FORMATS_BASE_URL + parts[3]).groupby([parts.index, parts[2]]).last().unstack()
+    else:
+        # No format items (e.g. nothing changed since the last refresh): every link is empty
+        links = pd.DataFrame(index=formatos.index)
+    links = links.reindex(index=formatos.index, columns=FORMAT_TYPES).fillna('').astype(str)
+    links.columns = [f'link_{format_type}' for format_type in FORMAT_TYPES]
+    return links
+
+
+def create_session(pool_size=8):
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=3)
+    session.mount('http://', adapter)
+    session.mount('https://', adapter)
+    return session
+
+
+def fetch_page(session, page, records_per_page):
+    params = {
+        'comp': 2,
+        'page': page + 1,
+        'min': page * records_per_page,
+        'max': records_per_page,
+        'element': '',
+        'filtros': FILTROS,
+        'texto': '',
+        'superAdmin': 'false'
+    }
+    response = session.get(BASE_URL, params=params, timeout=60)
+    response.raise_for_status()
+    return response.json()
+
+
+def total_records_from(data):
+    for key in TOTAL_KEYS:
+        if key in data:
+            return int(data[key])
+    # Some responses repeat the total in every record
+    records = data.get('data') or []
+    for key in TOTAL_KEYS:
+        if records and key in records[0]:
+            return int(records[0][key])
+    return None
+
+
+def fetch_catalog(session=None, records_per_page=50, max_workers=8):
+    session = session or create_session(pool_size=max_workers)
+    first_page = fetch_page(session, 0, records_per_page)
+    pages = [first_page['data']]
+
+    total_records = total_records_from(first_page)
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        if total_records is not None:
+            total_pages = math.ceil(total_records / records_per_page)
+            print(f"Fetching {total_records} records in {total_pages} pages")
+            for data in executor.map(lambda page: fetch_page(session, page, records_per_page),
+                                     range(1, total_pages)):
+                pages.append(data['data'])
         else:
-            print(f"Error fetching page {page + 1}: {response.status_code}")
-
-    # Create initial DataFrame
-    df = pd.DataFrame(all_data)
-
-    # Select required columns
-    selected_columns = [
-        'id_fuente_dato',
-        'id_tipo_fuente',
-        'metadato_privado',
-        'fecha_publicacion',
-        'fecha_actualizacion',
-        'id_tipo_licencia',
-        'id_termino_condiciones',
-        'nombre',
-        'descripcion',
-        'formatos',
-        'nombre_tematica',
-        'dependencia',
-        'id_metadata'
-    ]
-
-    df_filtered = df[selected_columns].copy()
-
-    # Process formats into separate columns with download links
-    df_filtered['processed_formats'] = df_filtered['formatos'].apply(process_formats)
-
-    # Create separate columns for each format type
-    format_types = ['GeoPackage', 'FileGeodatabase', 'GeoJson', 'CSV', 'ShapeFile', 'KMZ']
-    for format_type in format_types:
-        df_filtered[f'link_{format_type}'] = df_filtered['processed_formats'].apply(
-            lambda x: x.get(format_type, '')
-        )
-
-    # Drop the intermediate formats columns
-    df_filtered = df_filtered.drop(['formatos', 'processed_formats'], axis=1)
+            # Total unknown: fetch batches of pages until one comes back short
+            next_page = 1
+            while len(pages[-1]) == records_per_page:
+                batch = range(next_page, next_page + max_workers)
+                for data in executor.map(lambda page: fetch_page(session, page, records_per_page), batch):
+                    pages.append(data['data'])
+                    if len(data['data']) < records_per_page:
+                        break
+                next_page += max_workers
+
+    print(f"Fetched {len(pages)} pages")
+    return pd.DataFrame([record for page in pages for record in page])
+
+
+def diff_catalog(previous, fresh, key='id_fuente_dato'):
+    # Keep previous records that did not change and take new or updated ones from the fresh fetch
+    previous_dates = previous.set_index(previous[key].astype(str))['fecha_actualizacion'].astype(str)
+    fresh_dates = fresh[key].astype(str).map(previous_dates)
+    changed = fresh[fresh_dates.isna() | (fresh_dates != fresh['fecha_actualizacion'].astype(str))]
+    unchanged = previous[~previous[key].astype(str).isin(changed[key].astype(str))]
+    return changed, unchanged
+
+
+def fetch_geomedellin_data(output_file='medellin_geodata.csv', records_per_page=50, max_workers=8, session=None):
+    df = fetch_catalog(session, records_per_page=records_per_page, max_workers=max_workers)
+    df = df[SELECTED_COLUMNS].drop_duplicates('id_fuente_dato', keep='last')
+
+    output_path = Path(output_file)
+    if output_path.exists():
+        previous = pd.read_csv(output_path, dtype={'fecha_actualizacion': str}, keep_default_na=False)
+        changed, unchanged = diff_catalog(previous, df)
+        print(f"{len(changed)} new or updated records, {len(unchanged)} unchanged")
+    else:
+        changed, unchanged = df, None
+
+    # Process formats into separate columns with download links, only for the records that changed
+    changed = pd.concat([changed.drop(columns='formatos'), format_links(changed['formatos'])], axis=1)
+
+    if unchanged is not None:
+        df_filtered = pd.concat([unchanged, changed], ignore_index=True)
+        # Keep the order of the fresh catalogue, records no longer listed go last
+        order = pd.Index(df['id_fuente_dato'].astype(str))
+        position = order.get_indexer(df_filtered['id_fuente_dato'].astype(str))
+        position = np.where(position < 0, len(order), position)
+        df_filtered = df_filtered.iloc[np.argsort(position, kind='stable')].reset_index(drop=True)
+    else:
+        df_filtered = changed.reset_index(drop=True)
 
     # Save to CSV
-    output_file = 'medellin_geodata.csv'
-    df_filtered.to_csv(output_file, index=False, encoding='utf-8')
+    df_filtered.to_csv(output_path, index=False, encoding='utf-8')
     print(f"Data saved to {output_file}")
 
     return df_filtered
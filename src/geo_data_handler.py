@@ -1,43 +1,446 @@
+import json
 import geopandas as gpd
+import numpy as np
+import pandas as pd
+import pyarrow.ipc as pa_ipc
+import pyarrow.parquet as pq
+import pyogrio
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
+from pyproj import CRS
+from scipy.spatial import cKDTree
+
+# Projection used for metric computations in Medellín (UTM Zone 18N)
+UTM_CRS = 'EPSG:32618'
+
+
+def _spatial_partitions(geodata, n_partitions: int):
+    """Split row positions into spatially coherent chunks following the Hilbert curve
+
+    Missing and empty geometries have no Hilbert distance and go to a chunk of their own.
+    """
+    geometry = geodata.geometry
+    missing = (geometry.isna() | geometry.is_empty).to_numpy()
+    valid_positions = np.flatnonzero(~missing)
+
+    partitions = []
+    if len(valid_positions):
+        order = valid_positions[np.argsort(geometry.iloc[valid_positions].hilbert_distance(), kind='stable')]
+        partitions = [positions for positions in np.array_split(order, n_partitions) if len(positions)]
+    if missing.any():
+        partitions.append(np.flatnonzero(missing))
+    # Keep the original order inside each chunk
+    return [np.sort(positions) for positions in partitions]
+
+
+def _run_partitioned(geodata, kernel, n_jobs: int, *args):
+    """Run a geometry kernel on spatial partitions in a process pool, keeping the original row order"""
+    if geodata.empty:
+        return kernel(geodata, *args)
+    partitions = _spatial_partitions(geodata, n_jobs)
+    with ProcessPoolExecutor(max_workers=n_jobs) as pool:
+        results = list(pool.map(
+            kernel, [geodata.iloc[positions] for positions in partitions],
+            *[[arg] * len(partitions) for arg in args],
+        ))
+    positions = np.concatenate(partitions)
+    return pd.concat(results).iloc[np.argsort(positions)]
+
+
+def _buffer(geodata, distance):
+    return geodata.buffer(distance)
+
+
+def _simplify(geodata, tolerance):
+    return geodata.simplify(tolerance)
+
+
+def _to_crs(geodata, crs):
+    return geodata.to_crs(crs)
+
+
+def _area(geodata, crs):
+    return geodata.area if crs is None else geodata.to_crs(crs).area
+
+
+def _dissolve(geodata, column):
+    # Remember the first original position of each group to resolve 'first' across partitions
+    return geodata.dissolve(by=column, aggfunc={'_position': 'min'} | {
+        name: 'first' for name in geodata.columns if name not in (column, '_position', geodata.geometry.name)
+    })
+
+
+def _combine_dissolved(partials, column):
+    combined = pd.concat(partials).reset_index().sort_values('_position', kind='stable')
+    return _dissolve(combined, column)
 
 
 class GeoDataHandler:
     def __init__(self, geodata: gpd.GeoDataFrame):
         self.geodata: gpd.GeoDataFrame = geodata
 
+    @classmethod
+    def read_parquet(cls, filepath: str, columns: list = None, filters: list = None, bbox: tuple = None):
+        """Load GeoParquet reading only the given columns, rows matching filters and features in bbox
+
+        filters uses the pyarrow format, e.g. [('codigociiu', 'in', ['5511', '5512'])],
+        and bbox is (minx, miny, maxx, maxy) in the file's CRS.
+        """
+        if columns is not None:
+            columns = cls._with_geometry_column(columns, pq.read_schema(filepath))
+        return cls(gpd.read_parquet(filepath, columns=columns, filters=filters, bbox=bbox))
+
+    @classmethod
+    def read_feather(cls, filepath: str, columns: list = None, bbox: tuple = None):
+        """Load Feather reading only the given columns; bbox is applied after loading"""
+        if columns is not None:
+            with pa_ipc.open_file(filepath) as reader:
+                columns = cls._with_geometry_column(columns, reader.schema)
+        geodata = gpd.read_feather(filepath, columns=columns)
+        if bbox is not None:
+            geodata = geodata.cx[bbox[0]:bbox[2], bbox[1]:bbox[3]]
+        return cls(geodata)
+
+    @classmethod
+    def read_cached(cls, filepath: str, cache_dir: str = None, columns: list = None, filters: list = None,
+                    bbox: tuple = None):
+        """Load any vector file through a GeoParquet copy, converting it only on the first run
+
+        The copy is stored in cache_dir (next to the source by default) and
+        rebuilt when the source file is newer.
+        """
+        source = Path(filepath)
+        cache_path = Path(cache_dir or source.parent) / f"{source.stem}.parquet"
+        if not cache_path.exists() or cache_path.stat().st_mtime < source.stat().st_mtime:
+            cls.convert_to_parquet(source, cache_path)
+        return cls.read_parquet(cache_path, columns=columns, filters=filters, bbox=bbox)
+
+    @staticmethod
+    def convert_to_parquet(source_path: str, parquet_path: str):
+        """Convert a GeoJSON/GeoPackage/Shapefile to GeoParquet with a bbox column for pruning"""
+        parquet_path = Path(parquet_path)
+        parquet_path.parent.mkdir(parents=True, exist_ok=True)
+        GeoDataHandler(gpd.read_file(source_path)).export_parquet(parquet_path)
+        return parquet_path
+
+    @classmethod
+    def iter_chunks(cls, filepath: str, chunk_size: int = 50_000, columns: list = None):
+        """Yield a GeoJSON/GeoPackage/Shapefile as GeoDataHandler chunks of at most chunk_size features"""
+        stream = pyogrio.open_arrow(filepath, batch_size=chunk_size, columns=columns, use_pyarrow=True)
+        with stream as (meta, reader):
+            geometry_column = meta['geometry_name'] or 'wkb_geometry'
+            for batch in reader:
+                frame = batch.to_pandas()
+                geometry = gpd.GeoSeries.from_wkb(frame.pop(geometry_column), crs=meta['crs'])
+                yield cls(gpd.GeoDataFrame(frame, geometry=geometry.values, crs=meta['crs']))
+
+    @classmethod
+    def stream_process(cls, filepath: str, output_path: str = None, chunk_size: int = 50_000,
+                       columns: list = None, filter_column: str = None, values: list = None, crs=None,
+                       add_centroid=False, aggregate_by: str = None, driver: str = None):
+        """Filter, reproject and add centroids chunk by chunk, so peak memory depends on chunk_size
+
+        Each processed chunk is appended to output_path and/or counted by the
+        aggregate_by column. Returns the counts, or None without aggregate_by.
+        An existing output_path is removed first, so no file is left when no
+        feature matches the filter.
+        """
+        if output_path is not None:
+            # Otherwise the output of an earlier run would survive if no chunk is written
+            Path(output_path).unlink(missing_ok=True)
+        counts = None
+        mode = 'w'
+        for chunk in cls.iter_chunks(filepath, chunk_size=chunk_size, columns=columns):
+            if filter_column is not None:
+                chunk = chunk.filter_by_attribute(filter_column, values)
+            if chunk.geodata.empty:
+                continue
+            if crs is not None:
+                chunk = chunk.reproject(crs)
+            if add_centroid:
+                chunk = chunk.add_centroid()
+
+            if output_path is not None:
+                chunk.geodata.to_file(Path(output_path), driver=driver, mode=mode)
+                mode = 'a'
+            if aggregate_by is not None:
+                chunk_counts = chunk.geodata.groupby(aggregate_by).size()
+                counts = chunk_counts if counts is None else counts.add(chunk_counts, fill_value=0)
+
+        if counts is not None:
+            return counts.astype(int).sort_index()
+        return None
+
+    @staticmethod
+    def _with_geometry_column(columns: list, schema):
+        """Add the primary geometry column from the GeoArrow metadata if missing"""
+        geometry_column = json.loads(schema.metadata[b'geo'])['primary_column']
+        return list(columns) + ([geometry_column] if geometry_column not in columns else [])
+
+    @property
+    def geodata(self) -> gpd.GeoDataFrame:
+        return self._geodata
+
+    @geodata.setter
+    def geodata(self, geodata: gpd.GeoDataFrame):
+        self._geodata = geodata
+        self.invalidate_cache()
+
+    def invalidate_cache(self):
+        """Drop derived artifacts (spatial index, reprojected geometry, centroids, areas)
+
+        The cache is dropped automatically when geodata is replaced or its
+        geometry column or CRS change; call this after editing individual
+        geometries in place.
+        """
+        self._cache = {}
+        self._cache_token = None
+
+    def _cached(self, key, compute):
+        """Return a derived artifact, computing it only if the geometry changed"""
+        geometry = self._geodata.geometry
+        token = (id(geometry.values), geometry.crs)
+        if token != self._cache_token:
+            self._cache = {}
+            self._cache_token = token
+        if key not in self._cache:
+            self._cache[key] = compute()
+        return self._cache[key]
+
+    @property
+    def sindex(self):
+        """Spatial index over this layer's geometries, built once and reused"""
+        return self._cached(('sindex',), lambda: self.geodata.sindex)
+
+    def geometry_in(self, crs, n_jobs: int = None):
+        """Geometry reprojected to crs, computed once per CRS"""
+        crs = CRS.from_user_input(crs)
+        geometry = self.geodata.geometry
+        if geometry.crs is not None and geometry.crs.equals(crs):
+            return geometry
+        if n_jobs and n_jobs > 1:
+            return self._cached(('geometry', crs.to_wkt()), lambda: _run_partitioned(geometry, _to_crs, n_jobs, crs))
+        return self._cached(('geometry', crs.to_wkt()), lambda: geometry.to_crs(crs))
+
+    def centroids(self):
+        """Centroids in WGS84, computed in UTM unless geometries are points"""
+        def compute():
+            geometry = self.geodata.geometry
+            if geometry.geom_type.eq('Point').all():
+                # The centroid of a point is the point itself, no projection needed
+                centroids = geometry
+            else:
+                # Project to UTM Zone 18N (Medellín) for accurate centroid calculation
+                centroids = self.geometry_in(UTM_CRS).centroid
+            # Project centroids back to WGS84
+            if centroids.crs is not None and not centroids.crs.equals('EPSG:4326'):
+                centroids = centroids.to_crs('EPSG:4326')
+            return centroids
+
+        return self._cached(('centroids',), compute)
+
+    def lazy(self):
+        """Start a lazy query plan over this geodata"""
+        return LazyGeoDataHandler(self.geodata)
+
+    def select_columns(self, columns: list):
+        """Keep only the given columns and the geometry"""
+        geometry_column = self.geodata.geometry.name
+        columns = [column for column in columns if column != geometry_column]
+        return GeoDataHandler(self.geodata[columns + [geometry_column]])
+
     def filter_by_attribute(self, column: str, values: list):
         """Filter geodata by column values"""
         return GeoDataHandler(self.geodata[self.geodata[column].isin(values)])
 
+    def partition_by_mapping(self, column: str, mapping: dict, crs=None, add_centroid=False):
+        """Split geodata into one handler per category of a category -> values mapping
+
+        Rows are matched to categories with a single join against the mapping,
+        and the optional reprojection and centroids are computed once over the
+        union of all categories.
+        """
+        pairs = pd.DataFrame(
+            [(value, category) for category, values in mapping.items() for value in values],
+            columns=[column, '_category'],
+        )
+        matches = pd.DataFrame({
+            column: self.geodata[column].to_numpy(),
+            '_position': range(len(self.geodata)),
+        }).merge(pairs, on=column, how='inner')
+
+        union_positions = pd.unique(matches['_position'].sort_values())
+        union = GeoDataHandler(self.geodata.iloc[union_positions])
+        if crs is not None:
+            union = union.reproject(crs)
+        if add_centroid:
+            union = union.add_centroid()
+
+        positions_by_category = matches.groupby('_category', sort=False)['_position'].agg(list)
+        partitions = {}
+        for category in mapping:
+            positions = positions_by_category.get(category, [])
+            partitions[category] = GeoDataHandler(union.geodata.iloc[union_positions.searchsorted(positions)])
+        return partitions
+
+    @staticmethod
+    def export_partitions(partitions: dict, filepath_template: str, driver='GeoJSON'):
+        """Export every partition, formatting {key} in the path template with its category"""
+        for key, handler in partitions.items():
+            handler.export_geojson(filepath_template.format(key=key), driver=driver)
+        return partitions
+
     def count_by_attribute(self, column: str):
         """Count features grouped by column"""
         return self.geodata.groupby(column).size().reset_index(name='count')
 
     def spatial_join_count(self, other_layer: gpd.GeoDataFrame, join_column: str):
         """Count points within polygons"""
-        joined = gpd.sjoin(other_layer, self.geodata, how='left', predicate='contains')
-        return joined.groupby(join_column).size().reset_index(name='count')
+        # Same result as a left sjoin of other_layer 'contains' this layer grouped
+        # by join_column, but querying the cached index of this layer
+        other_positions, positions = self.sindex.query(
+            self._align_crs(other_layer).geometry.values, predicate='contains'
+        )
+        if join_column not in other_layer.columns:
+            # Column of this layer: only matched pairs have a value, unmatched rows are NaN and dropped
+            keys = pd.Series(self.geodata[join_column].to_numpy()[positions], name=join_column)
+            return keys.groupby(keys).size().reset_index(name='count')
+
+        matches = np.bincount(other_positions, minlength=len(other_layer))
+        # A left join keeps polygons without points as a single row
+        matches[matches == 0] = 1
+        counts = pd.Series(matches, index=other_layer.index).groupby(other_layer[join_column]).sum()
+        return counts.reset_index(name='count')
+
+    def _align_crs(self, other_layer: gpd.GeoDataFrame):
+        crs = self.geodata.crs
+        if other_layer.crs is not None and crs is not None and not other_layer.crs.equals(crs):
+            return other_layer.to_crs(crs)
+        return other_layer
+
+    def assign_points(self, points: gpd.GeoDataFrame, id_column: str):
+        """Assign each point the id of the polygon of this layer that contains it (NaN if none)"""
+        points = self._align_crs(points)
+        point_positions, polygon_positions = self.sindex.query(points.geometry.values, predicate='within')
+        # Keep the first polygon when polygons overlap
+        order = np.lexsort((polygon_positions, point_positions))
+        point_positions, first = np.unique(point_positions[order], return_index=True)
+        polygon_positions = polygon_positions[order][first]
+
+        polygon_ids = pd.Series(np.nan, index=points.index, dtype=object)
+        polygon_ids.iloc[point_positions] = self.geodata[id_column].to_numpy()[polygon_positions]
+        return polygon_ids.infer_objects()
+
+    def aggregate_points(self, points: gpd.GeoDataFrame, id_column: str, category_column: str = None,
+                         value_columns: list = None):
+        """Aggregate points by the polygon containing them
+
+        Returns, per polygon id, the count of points and their proportion over
+        all assigned points, the sum of each value column and, if a category
+        column is given, the count and proportion of every category (points
+        with a missing category only count towards the polygon total).
+        """
+        polygon_ids = self.assign_points(points, id_column)
+        assigned = polygon_ids.notna().to_numpy()
+        polygon_index = pd.Index(pd.unique(self.geodata[id_column]), name=id_column)
+        polygon_codes = polygon_index.get_indexer(polygon_ids[assigned])
+        n_polygons = len(polygon_index)
+
+        counts = np.bincount(polygon_codes, minlength=n_polygons)
+        result = pd.DataFrame({'count': counts}, index=polygon_index)
+        result['proportion'] = counts / counts.sum() if counts.sum() else 0.0
 
-    def buffer_analysis(self, distance):
-        """Create buffer around features"""
+        for value_column in value_columns or []:
+            values = points[value_column].to_numpy(dtype=float)[assigned]
+            result[f'{value_column}_sum'] = np.bincount(polygon_codes, weights=values, minlength=n_polygons)
+
+        if category_column is not None:
+            category_codes, categories = pd.factorize(points[category_column].to_numpy()[assigned], sort=True)
+            # Points with a missing category count towards the polygon total but no category
+            known = category_codes >= 0
+            crosstab = np.bincount(
+                polygon_codes[known] * len(categories) + category_codes[known], minlength=n_polygons * len(categories)
+            ).reshape(n_polygons, len(categories))
+            with np.errstate(invalid='ignore', divide='ignore'):
+                shares = np.where(counts[:, None] > 0, crosstab / counts[:, None], 0.0)
+            for position, category in enumerate(categories):
+                result[f'count_{category}'] = crosstab[:, position]
+            for position, category in enumerate(categories):
+                result[f'proportion_{category}'] = shares[:, position]
+        return result
+
+    def crosstab_points(self, points: gpd.GeoDataFrame, id_column: str, category_column: str, normalize=False):
+        """Count points per category (rows) and containing polygon (columns)"""
+        aggregated = self.aggregate_points(points, id_column, category_column=category_column)
+        prefix = 'proportion_' if normalize else 'count_'
+        crosstab = aggregated[[column for column in aggregated.columns if column.startswith(prefix)]]
+        crosstab.columns = pd.Index([column[len(prefix):] for column in crosstab.columns], name=category_column)
+        return crosstab.T
+
+    def buffer_analysis(self, distance, n_jobs: int = None):
+        """Create buffer around features (on n_jobs processes if given)"""
+        if n_jobs and n_jobs > 1:
+            return GeoDataHandler(_run_partitioned(self.geodata, _buffer, n_jobs, distance))
         return GeoDataHandler(self.geodata.copy().buffer(distance))
 
-    def calculate_area(self):
-        """Calculate area for polygon features"""
-        return self.geodata.area
+    def calculate_area(self, crs=None, n_jobs: int = None):
+        """Calculate area for polygon features (in crs units if given)"""
+        key = ('area', None if crs is None else CRS.from_user_input(crs).to_wkt())
+        if n_jobs and n_jobs > 1:
+            return self._cached(key, lambda: _run_partitioned(self.geodata.geometry, _area, n_jobs, crs))
+        return self._cached(key, lambda: self.geodata.area if crs is None else self.geometry_in(crs).area)
 
     def calculate_density(self, area_column: str, value_column: str):
         """Calculate density (value per area)"""
         return self.geodata[value_column] / self.geodata[area_column]
 
+    def nearest_index(self, crs=UTM_CRS):
+        """Nearest-neighbour index over this layer's points in crs, built once and reused"""
+        key = ('nearest_index', CRS.from_user_input(crs).to_wkt())
+        return self._cached(key, lambda: NearestNeighborIndex(self, crs=crs))
+
     def find_nearest(self, other_layer: gpd.GeoDataFrame, k=1):
-        """Find k-nearest features from other layer"""
-        return GeoDataHandler(self.geodata.sjoin_nearest(other_layer, k=k))
+        """Find k-nearest features from other layer
+
+        With k > 1 the other layer is treated as points (centroids otherwise)
+        and each feature is repeated once per neighbour, nearest first.
+        """
+        if k > 1:
+            other = other_layer if isinstance(other_layer, GeoDataHandler) else GeoDataHandler(other_layer)
+            _, positions = other.nearest_index().query(self, k=k)
+            positions = positions.ravel()
+            found = positions >= 0
+            left = self.geodata.iloc[np.repeat(np.arange(len(self.geodata)), k)[found]]
+            right = other.geodata.drop(columns=other.geodata.geometry.name).iloc[positions[found]]
+            # Suffix shared column names like sjoin_nearest does
+            shared = left.columns.intersection(right.columns)
+            left = left.rename(columns={name: f'{name}_left' for name in shared})
+            right = right.rename(columns={name: f'{name}_right' for name in shared})
+            right = right.reset_index(names='index_right').set_index(left.index)
+            return GeoDataHandler(pd.concat([left, right], axis=1))
+
+        if isinstance(other_layer, GeoDataHandler):
+            # Reuse the other layer's geometry (and its spatial index) in our CRS
+            geometry = other_layer.geometry_in(self.geodata.crs)
+            other_layer = other_layer._cached(
+                ('frame', geometry.crs.to_wkt()), lambda: other_layer.geodata.set_geometry(geometry)
+            )
+        return GeoDataHandler(self.geodata.sjoin_nearest(other_layer))
+
+    def dissolve_by_attribute(self, column: str, n_jobs: int = None):
+        """Merge features based on attribute (on n_jobs processes if given)"""
+        if not n_jobs or n_jobs < 2 or self.geodata.empty:
+            return GeoDataHandler(self.geodata.dissolve(by=column))
 
-    def dissolve_by_attribute(self, column: str):
-        """Merge features based on attribute"""
-        return GeoDataHandler(self.geodata.dissolve(by=column))
+        geodata = self.geodata.assign(_position=np.arange(len(self.geodata)))
+        partitions = [geodata.iloc[positions] for positions in _spatial_partitions(geodata, n_jobs)]
+        with ProcessPoolExecutor(max_workers=n_jobs) as pool:
+            partials = list(pool.map(_dissolve, partitions, [column] * len(partitions)))
+            # Combine the partial unions pairwise in a reduction tree
+            while len(partials) > 1:
+                pairs = [partials[start:start + 2] for start in range(0, len(partials), 2)]
+                partials = list(pool.map(_combine_dissolved, pairs, [column] * len(pairs)))
+        return GeoDataHandler(partials[0].drop(columns='_position'))
 
     def export_geojson(self, filepath: str, driver='GeoJSON'):
         """Export geodata to GeoJSON format"""
@@ -45,21 +448,191 @@ class GeoDataHandler:
         self.geodata.to_file(output_path, driver=driver)
         return self
 
-    def simplify_geometry(self, tolerance=0.001):
-        """Simplify geometries to reduce file size"""
+    def export_parquet(self, filepath: str):
+        """Export geodata to GeoParquet (WKB geometry) with a bbox column for pruning on load"""
+        self.geodata.to_parquet(Path(filepath), write_covering_bbox=True)
+        return self
+
+    def export_feather(self, filepath: str):
+        """Export geodata to Feather (WKB geometry)"""
+        self.geodata.to_feather(Path(filepath))
+        return self
+
+    def simplify_geometry(self, tolerance=0.001, n_jobs: int = None):
+        """Simplify geometries to reduce file size (on n_jobs processes if given)"""
+        if n_jobs and n_jobs > 1:
+            return GeoDataHandler(_run_partitioned(self.geodata, _simplify, n_jobs, tolerance))
         return GeoDataHandler(self.geodata.simplify(tolerance))
 
-    def reproject(self, crs='EPSG:4326'):
+    def reproject(self, crs='EPSG:4326', n_jobs: int = None):
         """Reproject to specified CRS (default WGS84 for web mapping)"""
-        return GeoDataHandler(self.geodata.to_crs(crs))
+        geometry = self.geometry_in(crs, n_jobs=n_jobs)
+        if isinstance(self.geodata, gpd.GeoSeries):
+            return GeoDataHandler(geometry)
+        return GeoDataHandler(self.geodata.set_geometry(geometry))
 
     def add_centroid(self):
         """Add centroid coordinates as columns using proper projection"""
-        # Project to UTM Zone 18N (Medellín) for accurate centroid calculation
-        temp_geodata = self.geodata.to_crs('EPSG:32618')
-        centroids = temp_geodata.geometry.centroid
-        # Project centroids back to WGS84
-        centroids = centroids.to_crs('EPSG:4326')
+        centroids = self.centroids()
         self.geodata['longitude'] = centroids.x
         self.geodata['latitude'] = centroids.y
         return self
+
+
+class NearestNeighborIndex:
+    """KD-tree over the points of a layer in projected coordinates
+
+    Built once and queried in batches: kNN and radius counts for a whole
+    layer come back as NumPy arrays of positions into the indexed layer,
+    with distances in crs units. Non-point geometries are indexed and
+    queried by their centroid. `workers` splits the queries across threads
+    (-1 uses all cores).
+    """
+
+    def __init__(self, points, crs=UTM_CRS, leaf_size: int = 16):
+        self.crs = CRS.from_user_input(crs)
+        self.index = points.geodata.index if isinstance(points, GeoDataHandler) else points.index
+        self.tree = cKDTree(self._coordinates(points), leafsize=leaf_size)
+
+    def __len__(self):
+        return self.tree.n
+
+    def _coordinates(self, layer):
+        if isinstance(layer, GeoDataHandler):
+            geometry = layer.geometry_in(self.crs)
+        else:
+            geometry = layer.geometry
+            if geometry.crs is not None and not geometry.crs.equals(self.crs):
+                geometry = geometry.to_crs(self.crs)
+        if not geometry.geom_type.eq('Point').all():
+            geometry = geometry.centroid
+        return np.column_stack([geometry.x.to_numpy(), geometry.y.to_numpy()])
+
+    def query(self, points, k: int = 1, max_distance: float = np.inf, workers: int = 1):
+        """Distances and positions of the k nearest indexed points to each query point
+
+        Both arrays have shape (n_points, k); neighbours farther than
+        max_distance get an infinite distance and position -1.
+        """
+        distances, positions = self.tree.query(
+            self._coordinates(points), k=[*range(1, k + 1)], distance_upper_bound=max_distance, workers=workers
+        )
+        positions = np.where(np.isinf(distances), -1, positions)
+        return distances, positions
+
+    def count_within(self, points, radius: float, workers: int = 1):
+        """Number of indexed points within radius of each query point"""
+        return self.tree.query_ball_point(self._coordinates(points), r=radius, return_length=True, workers=workers)
+
+    def neighbors_within(self, points, radius: float, workers: int = 1):
+        """Positions of the indexed points within radius of each query point (one array per point)"""
+        return self.tree.query_ball_point(self._coordinates(points), r=radius, workers=workers)
+
+    def labels(self, positions):
+        """Index labels of the indexed points at positions (-1 gives NaN)"""
+        labels = pd.Series(self.index, dtype=object).reindex(np.asarray(positions).ravel()).to_numpy()
+        return labels.reshape(np.shape(positions))
+
+
+class LazyGeoDataHandler:
+    """Records GeoDataHandler operations as a plan and runs an optimized version on collect.
+
+    The optimizer pushes attribute filters before reprojections and
+    centroids, computes centroids before reprojecting, merges consecutive
+    reprojections and drops the ones to the current CRS, and, when columns
+    are selected, discards the unused columns before any other work.
+    """
+
+    CENTROID_COLUMNS = ('longitude', 'latitude')
+
+    def __init__(self, geodata: gpd.GeoDataFrame, plan: list = None):
+        self.geodata: gpd.GeoDataFrame = geodata
+        self.plan: list = plan or []
+
+    def _then(self, operation: str, **kwargs):
+        return LazyGeoDataHandler(self.geodata, self.plan + [(operation, kwargs)])
+
+    def filter_by_attribute(self, column: str, values: list):
+        """Filter geodata by column values"""
+        return self._then('filter_by_attribute', column=column, values=values)
+
+    def select_columns(self, columns: list):
+        """Keep only the given columns and the geometry"""
+        return self._then('select_columns', columns=list(columns))
+
+    def reproject(self, crs='EPSG:4326'):
+        """Reproject to specified CRS (default WGS84 for web mapping)"""
+        return self._then('reproject', crs=crs)
+
+    def simplify_geometry(self, tolerance=0.001):
+        """Simplify geometries to reduce file size"""
+        return self._then('simplify_geometry', tolerance=tolerance)
+
+    def add_centroid(self):
+        """Add centroid coordinates as columns using proper projection"""
+        return self._then('add_centroid')
+
+    def optimized_plan(self):
+        """Return the plan after applying the optimization rules"""
+        plan = list(self.plan)
+
+        # Move filters and centroids as early as the operations before them allow
+        for position in range(len(plan)):
+            while position > 0 and self._can_swap(plan[position - 1], plan[position]):
+                plan[position - 1], plan[position] = plan[position], plan[position - 1]
+                position -= 1
+
+        # Only the last of consecutive reprojections matters
+        plan = [
+            step for position, step in enumerate(plan)
+            if not (step[0] == 'reproject' and position + 1 < len(plan) and plan[position + 1][0] == 'reproject')
+        ]
+
+        needed_columns = self._needed_columns(plan)
+        if needed_columns is not None:
+            geometry_column = self.geodata.geometry.name
+            source_columns = [column for column in self.geodata.columns
+                              if column in needed_columns and column != geometry_column]
+            plan.insert(0, ('select_columns', {'columns': source_columns}))
+        return plan
+
+    def _can_swap(self, previous, step):
+        """Whether step can run before previous without changing the result"""
+        operation, kwargs = step
+        if operation == 'filter_by_attribute':
+            if previous[0] == 'add_centroid':
+                return kwargs['column'] not in self.CENTROID_COLUMNS
+            return previous[0] in ('reproject', 'simplify_geometry', 'select_columns')
+        if operation == 'add_centroid':
+            # Centroids are always computed in UTM, whatever the current CRS
+            return previous[0] == 'reproject'
+        return False
+
+    def _needed_columns(self, plan):
+        """Columns of the source used by the plan, or None if all of them are"""
+        needed_columns = None
+        for operation, kwargs in reversed(plan):
+            if operation == 'select_columns':
+                columns = set(kwargs['columns'])
+                needed_columns = columns if needed_columns is None else needed_columns & columns
+            elif needed_columns is None:
+                continue
+            elif operation == 'filter_by_attribute':
+                needed_columns.add(kwargs['column'])
+            elif operation == 'add_centroid':
+                needed_columns -= set(self.CENTROID_COLUMNS)
+        return needed_columns
+
+    def collect(self):
+        """Run the optimized plan and return the resulting GeoDataHandler"""
+        handler = GeoDataHandler(self.geodata.copy(deep=False))
+        for operation, kwargs in self.optimized_plan():
+            if operation == 'reproject' and handler.geodata.crs is not None \
+                    and handler.geodata.crs.equals(kwargs['crs']):
+                continue
+            handler = getattr(handler, operation)(**kwargs)
+        return handler
+
+    def export_geojson(self, filepath: str, driver='GeoJSON'):
+        """Run the plan and export the result to GeoJSON format"""
+        return self.collect().export_geojson(filepath, driver=driver)
@@ -0,0 +1,126 @@
+import numpy as np
+import pandas as pd
+from scipy import sparse
+import networkx as nx
+
+
+class MultiplexAnalytics:
+    """Cross-layer metrics of a multiplex network computed on sparse matrices.
+
+    All layers are read as CSR adjacency matrices over the shared node index
+    of the multiplex network, so each metric is computed for every node and
+    every layer at once instead of looping over networkx graphs.
+
+    Attributes:
+        multiplex (MultiplexNetwork): Multiplex network to analyze.
+        layer_names (list): Layers included in the analysis.
+    """
+
+    def __init__(self, multiplex, layer_names=None):
+        self.multiplex = multiplex
+        self.layer_names = multiplex.layer_names if layer_names is None else list(layer_names)
+        self._adjacency = {name: multiplex.get_adjacency(name) for name in self.layer_names}
+
+    @property
+    def _node_index(self):
+        return pd.Index(self.multiplex.nodes, name=self.multiplex.node_column_name)
+
+    def node_metrics(self):
+        """Computes the multiplex metrics of every node.
+
+        Returns:
+            pd.DataFrame: Indexed by node name, with the degree in each layer
+                (`degree_<layer>`), the multiplex degree (number of distinct
+                neighbors across layers), the overlapping degree (sum of the
+                degrees over layers) and the participation coefficient.
+        """
+        degrees = self.multiplex.multiplex_degree(self.layer_names)
+        metrics = degrees.add_prefix("degree_")
+        metrics["multiplex_degree"] = self.multiplex.overlay_adjacency(self.layer_names).getnnz(axis=1)
+        metrics["overlapping_degree"] = degrees.sum(axis=1)
+        metrics["participation_coefficient"] = self.multiplex.participation_coefficient(self.layer_names)
+        return metrics
+
+    def edge_overlap(self):
+        """Counts the edges shared by every pair of layers.
+
+        Returns:
+            pd.DataFrame: Square matrix of shared edges, with the number of
+                edges of each layer on the diagonal.
+        """
+        return pd.DataFrame(
+            self._shared_edges(), index=self.layer_names, columns=self.layer_names
+        )
+
+    def jaccard_similarity(self):
+        """Computes the Jaccard similarity between the edge sets of every pair of layers.
+
+        Returns:
+            pd.DataFrame: Square matrix with the number of shared edges divided
+                by the number of edges in the union of both layers.
+        """
+        shared = self._shared_edges().astype(float)
+        sizes = np.diag(shared)
+        union = sizes[:, None] + sizes[None, :] - shared
+        similarity = np.divide(shared, union, out=np.zeros_like(shared), where=union > 0)
+        return pd.DataFrame(similarity, index=self.layer_names, columns=self.layer_names)
+
+    def communities(self, resolution=1.0, weighted=True, seed=0):
+        """Detects communities on the aggregated multiplex network with Louvain.
+
+        Args:
+            resolution (float): Resolution of the modularity; higher values
+                give smaller communities.
+            weighted (bool): If True, aggregates the edge weights of all
+                layers; otherwise uses the number of layers sharing each edge.
+            seed (int): Random seed, so that the partition is reproducible.
+
+        Returns:
+            pd.Series: Community id of every node, indexed by node name.
+        """
+        if weighted:
+            aggregated = self.multiplex.aggregate_adjacency(self.layer_names)
+        else:
+            aggregated = self.multiplex.edge_overlap(self.layer_names)
+
+        aggregated_graph = nx.from_scipy_sparse_array(aggregated)
+        partition = nx.community.louvain_communities(
+            aggregated_graph, weight="weight", resolution=resolution, seed=seed
+        )
+
+        labels = np.empty(len(self.multiplex.nodes), dtype=np.int64)
+        # Number communities by their smallest node position so ids are stable.
+        for community_id, members in enumerate(sorted(partition, key=min)):
+            labels[list(members)] = community_id
+        return pd.Series(labels, index=self._node_index, name="community")
+
+    def report(self, resolution=1.0, seed=0):
+        """Computes the node metrics together with the community of each node.
+
+        Args:
+            resolution (float): Resolution of the community detection.
+            seed (int): Random seed of the community detection.
+
+        Returns:
+            pd.DataFrame: Node metrics and community, indexed by node name.
+        """
+        metrics = self.node_metrics()
+        metrics["community"] = self.communities(resolution=resolution, seed=seed)
+        return metrics
+
+    def _shared_edges(self):
+        """Returns the layers × layers matrix of shared edge counts."""
+        n_nodes = len(self.multiplex.nodes)
+        edge_keys = []
+        for adjacency in self._adjacency.values():
+            upper = sparse.triu(adjacency, k=1, format="coo")
+            edge_keys.append(upper.row.astype(np.int64) * n_nodes + upper.col)
+
+        # Incidence matrix of edges (rows) by layers (columns).
+        all_keys, edge_ids = np.unique(np.concatenate(edge_keys), return_inverse=True)
+        layer_ids = np.repeat(np.arange(len(edge_keys)), [len(keys) for keys in edge_keys])
+        incidence = sparse.csr_matrix(
+            (np.ones(len(edge_ids), dtype=np.int64), (edge_ids, layer_ids)),
+            shape=(len(all_keys), len(edge_keys)),
+        )
+        return (incidence.T @ incidence).toarray()
@@ -1,18 +1,141 @@
 import numpy as np
 import pandas as pd
-from scipy.spatial.distance import euclidean
+from scipy import sparse
+from scipy.spatial import cKDTree
+from scipy.spatial.distance import cdist, cosine, euclidean, mahalanobis, pdist, seuclidean, squareform
 import networkx as nx
 from abc import ABC, abstractmethod
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from multiprocessing import shared_memory
+from pathlib import Path
+import hashlib
+import importlib
+import json
+import os
+import struct
+import zipfile
 
 
 class DistanceStrategy(ABC):
-    """Abstract base class for distance calculation strategies."""
+    """Abstract base class for distance calculation strategies.
+
+    Attributes:
+        data_dependent (bool): True when the distance between two nodes depends
+            on the attributes of the other nodes (e.g. parameters estimated
+            from the data), so layers cannot be patched incrementally.
+    """
+
+    data_dependent = False
 
     @abstractmethod
     def calculate(self, vector1, vector2):
         """Abstract method for calculating distance between two vectors."""
         pass
 
+    def pairwise(self, matrix, square=False):
+        """Calculates the distances between all pairs of rows of a matrix.
+
+        This default implementation calls `calculate` once per pair, so any
+        custom strategy works out of the box. Subclasses override it with a
+        vectorized implementation when one is available.
+
+        Args:
+            matrix (array-like): Array of shape (n_nodes, n_attributes).
+            square (bool): If True, returns the square distance matrix instead
+                of the condensed one.
+
+        Returns:
+            np.ndarray: Condensed (as returned by `pdist`) or square distance matrix.
+        """
+        return _pairwise_from_calculate(self.calculate, matrix, square)
+
+    def cross(self, matrix1, matrix2):
+        """Calculates the distances between every row of one matrix and every row of another.
+
+        Args:
+            matrix1 (array-like): Array of shape (n_rows1, n_attributes).
+            matrix2 (array-like): Array of shape (n_rows2, n_attributes).
+
+        Returns:
+            np.ndarray: Distance matrix of shape (n_rows1, n_rows2).
+        """
+        return _cross_from_calculate(self.calculate, matrix1, matrix2)
+
+    def embed(self, matrix):
+        """Maps the attribute matrix to a space where this distance is Euclidean.
+
+        Spatial indexes such as KD-trees only support Euclidean distances, so
+        strategies that can be expressed as a linear transform of the
+        attributes return the transformed matrix here.
+
+        Args:
+            matrix (array-like): Array of shape (n_nodes, n_attributes).
+
+        Returns:
+            np.ndarray: Transformed matrix, or None if the strategy has no
+                Euclidean embedding.
+        """
+        return None
+
+
+def _pairwise_from_calculate(calculate, matrix, square=False):
+    """Builds a condensed distance matrix calling `calculate` once per pair."""
+    matrix = np.asarray(matrix, dtype=float)
+    rows, cols = np.triu_indices(len(matrix), k=1)
+    distances = np.fromiter(
+        (calculate(matrix[i], matrix[j]) for i, j in zip(rows, cols)),
+        dtype=float,
+        count=len(rows),
+    )
+    return squareform(distances) if square else distances
+
+
+def _cross_from_calculate(calculate, matrix1, matrix2):
+    """Builds a rectangular distance matrix calling `calculate` once per pair."""
+    matrix1 = np.asarray(matrix1, dtype=float)
+    matrix2 = np.asarray(matrix2, dtype=float)
+    distances = np.fromiter(
+        (calculate(vector1, vector2) for vector1 in matrix1 for vector2 in matrix2),
+        dtype=float,
+        count=len(matrix1) * len(matrix2),
+    )
+    return distances.reshape(len(matrix1), len(matrix2))
+
+
+def cross_distances(distance_strategy, matrix1, matrix2):
+    """Calculates the distances between two sets of rows using the fastest path of a strategy.
+
+    Args:
+        distance_strategy: Strategy object for calculating distances.
+        matrix1 (array-like): Array of shape (n_rows1, n_attributes).
+        matrix2 (array-like): Array of shape (n_rows2, n_attributes).
+
+    Returns:
+        np.ndarray: Distance matrix of shape (n_rows1, n_rows2).
+    """
+    if hasattr(distance_strategy, "cross"):
+        return distance_strategy.cross(matrix1, matrix2)
+    return _cross_from_calculate(distance_strategy.calculate, matrix1, matrix2)
+
+
+def pairwise_distances(distance_strategy, matrix, square=False):
+    """Calculates all pairwise distances using the fastest path of a strategy.
+
+    Strategies that do not inherit from `DistanceStrategy` and only provide a
+    per-pair `calculate` method fall back to the pair-by-pair computation.
+
+    Args:
+        distance_strategy: Strategy object for calculating distances.
+        matrix (array-like): Array of shape (n_nodes, n_attributes).
+        square (bool): If True, returns the square distance matrix.
+
+    Returns:
+        np.ndarray: Condensed or square distance matrix.
+    """
+    if hasattr(distance_strategy, "pairwise"):
+        return distance_strategy.pairwise(matrix, square=square)
+    return _pairwise_from_calculate(distance_strategy.calculate, matrix, square)
+
 
 class EuclidianDistance(DistanceStrategy):
     """Strategy for calculating distance between neighborhoods using Euclidean Distance.
@@ -34,6 +157,244 @@ class EuclidianDistance(DistanceStrategy):
         """
         return euclidean(vector1, vector2)
 
+    def pairwise(self, matrix, square=False):
+        """Calculates the Euclidean distances between all pairs of rows."""
+        distances = pdist(np.asarray(matrix, dtype=float), metric="euclidean")
+        return squareform(distances) if square else distances
+
+    def cross(self, matrix1, matrix2):
+        """Calculates the Euclidean distances between two sets of rows."""
+        return cdist(np.asarray(matrix1, dtype=float), np.asarray(matrix2, dtype=float), metric="euclidean")
+
+    def embed(self, matrix):
+        """Returns the attribute matrix unchanged."""
+        return np.asarray(matrix, dtype=float)
+
+
+class WeightedEuclidianDistance(DistanceStrategy):
+    """Strategy for calculating a weighted Euclidean distance between neighborhoods.
+
+    Attributes:
+        weights (np.ndarray): Non-negative weight of each attribute.
+    """
+
+    def __init__(self, weights):
+        self.weights = np.asarray(weights, dtype=float)
+
+    def calculate(self, vector1, vector2):
+        """Calculates the weighted Euclidean distance between two vectors.
+
+        Args:
+            vector1 (array-like): First vector of attributes.
+            vector2 (array-like): Second vector of attributes.
+
+        Returns:
+            float: The weighted Euclidean distance between the vectors.
+        """
+        return euclidean(vector1, vector2, w=self.weights)
+
+    def pairwise(self, matrix, square=False):
+        """Calculates the weighted Euclidean distances between all pairs of rows."""
+        distances = pdist(np.asarray(matrix, dtype=float), metric="euclidean", w=self.weights)
+        return squareform(distances) if square else distances
+
+    def cross(self, matrix1, matrix2):
+        """Calculates the weighted Euclidean distances between two sets of rows."""
+        return cdist(
+            np.asarray(matrix1, dtype=float), np.asarray(matrix2, dtype=float), metric="euclidean", w=self.weights
+        )
+
+    def embed(self, matrix):
+        """Scales each attribute by the square root of its weight."""
+        return np.asarray(matrix, dtype=float) * np.sqrt(self.weights)
+
+
+class StandardizedEuclidianDistance(DistanceStrategy):
+    """Strategy for calculating the standardized Euclidean distance between neighborhoods.
+
+    Each attribute is scaled by its variance, so attributes measured in
+    different units contribute comparably to the distance.
+
+    Attributes:
+        variances (np.ndarray): Variance of each attribute. If None, it is
+            estimated from the matrix passed to `pairwise`.
+    """
+
+    def __init__(self, variances=None):
+        self.variances = None if variances is None else np.asarray(variances, dtype=float)
+
+    @property
+    def data_dependent(self):
+        """bool: True when the variances are estimated from the data."""
+        return self.variances is None
+
+    @classmethod
+    def from_data(cls, matrix):
+        """Creates the strategy with the variances of an attribute matrix.
+
+        Args:
+            matrix (array-like): Array of shape (n_nodes, n_attributes).
+
+        Returns:
+            StandardizedEuclidianDistance: Strategy with precomputed variances.
+        """
+        return cls(np.var(np.asarray(matrix, dtype=float), axis=0, ddof=1))
+
+    def calculate(self, vector1, vector2):
+        """Calculates the standardized Euclidean distance between two vectors.
+
+        Args:
+            vector1 (array-like): First vector of attributes.
+            vector2 (array-like): Second vector of attributes.
+
+        Returns:
+            float: The standardized Euclidean distance between the vectors.
+
+        Raises:
+            ValueError: If the variances were not provided.
+        """
+        if self.variances is None:
+            raise ValueError("Variances are required to compare a single pair of vectors.")
+        return seuclidean(vector1, vector2, self.variances)
+
+    def pairwise(self, matrix, square=False):
+        """Calculates the standardized Euclidean distances between all pairs of rows."""
+        distances = pdist(np.asarray(matrix, dtype=float), metric="seuclidean", V=self.variances)
+        return squareform(distances) if square else distances
+
+    def cross(self, matrix1, matrix2):
+        """Calculates the standardized Euclidean distances between two sets of rows.
+
+        Raises:
+            ValueError: If the variances were not provided.
+        """
+        if self.variances is None:
+            raise ValueError("Variances are required to compare two sets of vectors.")
+        return cdist(
+            np.asarray(matrix1, dtype=float), np.asarray(matrix2, dtype=float), metric="seuclidean", V=self.variances
+        )
+
+    def embed(self, matrix):
+        """Scales each attribute by the inverse of its standard deviation."""
+        matrix = np.asarray(matrix, dtype=float)
+        variances = self.variances
+        if variances is None:
+            variances = self.from_data(matrix).variances
+        return matrix / np.sqrt(variances)
+
+
+class MahalanobisDistance(DistanceStrategy):
+    """Strategy for calculating the Mahalanobis distance between neighborhoods.
+
+    Attributes:
+        inverse_covariance (np.ndarray): Inverse of the covariance matrix of the
+            attributes. If None, it is estimated from the matrix passed to
+            `pairwise`.
+    """
+
+    def __init__(self, inverse_covariance=None):
+        self.inverse_covariance = (
+            None if inverse_covariance is None else np.asarray(inverse_covariance, dtype=float)
+        )
+
+    @property
+    def data_dependent(self):
+        """bool: True when the inverse covariance is estimated from the data."""
+        return self.inverse_covariance is None
+
+    @classmethod
+    def from_data(cls, matrix):
+        """Creates the strategy with the inverse covariance of an attribute matrix.
+
+        The pseudo-inverse is used so that collinear attributes do not make
+        the covariance matrix singular.
+
+        Args:
+            matrix (array-like): Array of shape (n_nodes, n_attributes).
+
+        Returns:
+            MahalanobisDistance: Strategy with precomputed inverse covariance.
+        """
+        covariance = np.cov(np.asarray(matrix, dtype=float), rowvar=False)
+        return cls(np.linalg.pinv(np.atleast_2d(covariance)))
+
+    def calculate(self, vector1, vector2):
+        """Calculates the Mahalanobis distance between two vectors.
+
+        Args:
+            vector1 (array-like): First vector of attributes.
+            vector2 (array-like): Second vector of attributes.
+
+        Returns:
+            float: The Mahalanobis distance between the vectors.
+
+        Raises:
+            ValueError: If the inverse covariance was not provided.
+        """
+        if self.inverse_covariance is None:
+            raise ValueError("An inverse covariance is required to compare a single pair of vectors.")
+        return mahalanobis(vector1, vector2, self.inverse_covariance)
+
+    def pairwise(self, matrix, square=False):
+        """Calculates the Mahalanobis distances between all pairs of rows."""
+        matrix = np.asarray(matrix, dtype=float)
+        inverse_covariance = self.inverse_covariance
+        if inverse_covariance is None:
+            inverse_covariance = self.from_data(matrix).inverse_covariance
+        distances = pdist(matrix, metric="mahalanobis", VI=inverse_covariance)
+        return squareform(distances) if square else distances
+
+    def cross(self, matrix1, matrix2):
+        """Calculates the Mahalanobis distances between two sets of rows.
+
+        Raises:
+            ValueError: If the inverse covariance was not provided.
+        """
+        if self.inverse_covariance is None:
+            raise ValueError("An inverse covariance is required to compare two sets of vectors.")
+        return cdist(
+            np.asarray(matrix1, dtype=float), np.asarray(matrix2, dtype=float), metric="mahalanobis",
+            VI=self.inverse_covariance,
+        )
+
+    def embed(self, matrix):
+        """Whitens the attributes with the square root of the inverse covariance."""
+        matrix = np.asarray(matrix, dtype=float)
+        inverse_covariance = self.inverse_covariance
+        if inverse_covariance is None:
+            inverse_covariance = self.from_data(matrix).inverse_covariance
+        eigenvalues, eigenvectors = np.linalg.eigh(inverse_covariance)
+        return matrix @ (eigenvectors * np.sqrt(np.clip(eigenvalues, 0, None)))
+
+
+class CosineDistance(DistanceStrategy):
+    """Strategy for calculating the cosine distance between neighborhoods.
+
+    Compares the profile of the attributes regardless of their magnitude.
+    """
+
+    @staticmethod
+    def calculate(vector1, vector2):
+        """Calculates the cosine distance between two vectors.
+
+        Args:
+            vector1 (array-like): First vector of attributes.
+            vector2 (array-like): Second vector of attributes.
+
+        Returns:
+            float: The cosine distance between the vectors.
+        """
+        return cosine(vector1, vector2)
+
+    def pairwise(self, matrix, square=False):
+        """Calculates the cosine distances between all pairs of rows."""
+        distances = pdist(np.asarray(matrix, dtype=float), metric="cosine")
+        return squareform(distances) if square else distances
+
+    def cross(self, matrix1, matrix2):
+        """Calculates the cosine distances between two sets of rows."""
+        return cdist(np.asarray(matrix1, dtype=float), np.asarray(matrix2, dtype=float), metric="cosine")
+
 
 class LayerFactory:
     """Factory for building layers of the multiplex network.
@@ -53,6 +414,10 @@ class LayerFactory:
     def create_layer(self, barrios_data: pd.DataFrame, attributes_list: list, node_column_name: str):
         """Creates a network layer based on the specified attributes.
 
+        The attribute matrix is extracted once and all pairwise distances are
+        computed as a single condensed block, so the threshold is applied with
+        a vectorized mask instead of a Python loop over every pair.
+
         Args:
             barrios_data (pd.DataFrame): DataFrame containing neighborhood data and attributes.
             attributes_list (list): List of attribute column names to form the vector.
@@ -61,22 +426,341 @@ class LayerFactory:
         Returns:
             nx.Graph: Graph of the layer with weighted edges.
         """
+        matrix = barrios_data[attributes_list].to_numpy(dtype=float)
+        nodes = barrios_data[node_column_name].to_numpy()
+
+        rows, cols, weights = self.create_edges(matrix)
+
         layer_graph = nx.Graph()
+        layer_graph.add_weighted_edges_from(zip(nodes[rows], nodes[cols], weights))
+        return layer_graph
+
+    def create_edges(self, matrix: np.ndarray):
+        """Computes the edges of a layer from an attribute matrix.
+
+        Args:
+            matrix (np.ndarray): Array of shape (n_nodes, n_attributes).
+
+        Returns:
+            tuple: Row positions, column positions and weights of the edges,
+                ordered like the upper triangle of the distance matrix.
+        """
+        distances = pairwise_distances(self.distance_strategy, matrix)
+        rows, cols = np.triu_indices(len(matrix), k=1)
+
+        mask = distances <= self.threshold
+        return rows[mask], cols[mask], 1 / (1 + distances[mask])
 
-        for i, barrio_i in barrios_data.iterrows():
-            for j, barrio_j in barrios_data.iterrows():
-                if i < j:
-                    vector1 = barrio_i[attributes_list].values
-                    vector2 = barrio_j[attributes_list].values
-                    distance = self.distance_strategy.calculate(vector1, vector2)
+    @staticmethod
+    def sweep_edges(distance_strategy, matrix: np.ndarray, thresholds):
+        """Yields the edges added at each threshold of an increasing sweep.
+
+        The pairwise distances are computed and sorted once, so each threshold
+        only slices the pairs that fall between it and the previous one.
 
-                    if distance <= self.threshold:
-                        layer_graph.add_edge(
-                            barrio_i[node_column_name], barrio_j[node_column_name], weight=1 / (1 + distance)
-                        )
+        Args:
+            distance_strategy: Strategy object for calculating distances.
+            matrix (np.ndarray): Array of shape (n_nodes, n_attributes).
+            thresholds (iterable): Thresholds to evaluate, in any order.
 
+        Yields:
+            tuple: Threshold, and row positions, column positions and distances
+                of the edges that join the layer at that threshold.
+        """
+        distances = pairwise_distances(distance_strategy, matrix)
+        rows, cols = np.triu_indices(len(matrix), k=1)
+
+        order = np.argsort(distances, kind="stable")
+        sorted_distances = distances[order]
+
+        start = 0
+        for threshold in sorted(thresholds):
+            end = max(start, np.searchsorted(sorted_distances, threshold, side="right"))
+            new_pairs = order[start:end]
+            yield threshold, rows[new_pairs], cols[new_pairs], distances[new_pairs]
+            start = end
+
+
+class NeighborLayerFactory(LayerFactory):
+    """Factory for building layers of large node sets with a spatial index.
+
+    Instead of a dense distance matrix, the attribute vectors are indexed in a
+    KD-tree and only the pairs within `threshold` (radius mode) or the
+    `n_neighbors` nearest neighbors of each node (kNN mode) are queried. The
+    nodes are processed in chunks, so memory grows with the number of edges
+    instead of with the square of the number of nodes.
+
+    The distance strategy must provide a Euclidean embedding (see
+    `DistanceStrategy.embed`).
+
+    Attributes:
+        distance_strategy: Strategy object for calculating distances.
+        threshold (float): Maximum distance threshold for creating connections.
+            In kNN mode it optionally discards neighbors farther than it.
+        n_neighbors (int): If set, connects each node to its k nearest neighbors.
+        chunk_size (int): Number of nodes queried at a time.
+        leaf_size (int): Leaf size of the KD-tree.
+    """
+
+    def __init__(self, distance_strategy, threshold=None, n_neighbors=None, chunk_size=2048, leaf_size=16):
+        if threshold is None and n_neighbors is None:
+            raise ValueError("Either threshold or n_neighbors must be provided.")
+        super().__init__(distance_strategy, threshold)
+        self.n_neighbors = n_neighbors
+        self.chunk_size = chunk_size
+        self.leaf_size = leaf_size
+
+    def create_layer(self, barrios_data: pd.DataFrame, attributes_list: list, node_column_name: str):
+        """Creates a network layer streaming the edges found by the spatial index.
+
+        Args:
+            barrios_data (pd.DataFrame): DataFrame containing neighborhood data and attributes.
+            attributes_list (list): List of attribute column names to form the vector.
+            node_column_name (str): Name of the column containing neighborhood names.
+
+        Returns:
+            nx.Graph: Graph of the layer with weighted edges.
+        """
+        matrix = barrios_data[attributes_list].to_numpy(dtype=float)
+        nodes = barrios_data[node_column_name].to_numpy()
+
+        layer_graph = nx.Graph()
+        for rows, cols, weights in self.iter_edges(matrix):
+            layer_graph.add_weighted_edges_from(zip(nodes[rows], nodes[cols], weights))
         return layer_graph
 
+    def create_edges(self, matrix: np.ndarray):
+        """Computes the edges of a layer from an attribute matrix.
+
+        Args:
+            matrix (np.ndarray): Array of shape (n_nodes, n_attributes).
+
+        Returns:
+            tuple: Row positions, column positions and weights of the edges,
+                sorted by row and then by column.
+        """
+        chunks = list(self.iter_edges(matrix))
+        if not chunks:
+            return np.empty(0, dtype=np.intp), np.empty(0, dtype=np.intp), np.empty(0)
+        return tuple(np.concatenate(parts) for parts in zip(*chunks))
+
+    def iter_edges(self, matrix: np.ndarray):
+        """Yields the edges of the layer in chunks.
+
+        Args:
+            matrix (np.ndarray): Array of shape (n_nodes, n_attributes).
+
+        Yields:
+            tuple: Row positions, column positions and weights of a chunk of edges.
+        """
+        points = self.distance_strategy.embed(matrix) if hasattr(self.distance_strategy, "embed") else None
+        if points is None:
+            raise ValueError(
+                f"{type(self.distance_strategy).__name__} has no Euclidean embedding "
+                "and cannot be used with a spatial index."
+            )
+
+        tree = cKDTree(points, leafsize=self.leaf_size)
+        if self.n_neighbors is None:
+            yield from self._iter_radius_edges(tree, points)
+        else:
+            yield from self._iter_knn_edges(tree, points)
+
+    def _iter_radius_edges(self, tree, points):
+        """Yields the pairs within `threshold`, one chunk of rows at a time."""
+        for start in range(0, len(points), self.chunk_size):
+            chunk_tree = cKDTree(points[start:start + self.chunk_size], leafsize=self.leaf_size)
+            pairs = chunk_tree.sparse_distance_matrix(tree, self.threshold, output_type="ndarray")
+
+            rows = pairs["i"].astype(np.intp) + start
+            cols = pairs["j"].astype(np.intp)
+            keep = rows < cols
+            rows, cols, distances = rows[keep], cols[keep], pairs["v"][keep]
+
+            order = np.lexsort((cols, rows))
+            yield rows[order], cols[order], 1 / (1 + distances[order])
+
+    def _iter_knn_edges(self, tree, points):
+        """Yields the union of the k-nearest-neighbor pairs of every node."""
+        n_nodes = len(points)
+        n_neighbors = min(self.n_neighbors, n_nodes - 1)
+        if n_neighbors < 1:
+            return
+
+        all_rows, all_cols, all_distances = [], [], []
+        for start in range(0, n_nodes, self.chunk_size):
+            distances, neighbors = tree.query(points[start:start + self.chunk_size], k=n_neighbors + 1)
+            sources = np.arange(start, start + len(neighbors))[:, None]
+
+            # Drop each node from its own neighbor list; with duplicated vectors
+            # the node itself is not guaranteed to come first.
+            not_self = neighbors != sources
+            rank = np.cumsum(not_self, axis=1)
+            keep = not_self & (rank <= n_neighbors)
+            if self.threshold is not None:
+                keep &= distances <= self.threshold
+
+            sources = np.broadcast_to(sources, neighbors.shape)[keep]
+            targets = neighbors[keep]
+            all_rows.append(np.minimum(sources, targets))
+            all_cols.append(np.maximum(sources, targets))
+            all_distances.append(distances[keep])
+
+        rows = np.concatenate(all_rows)
+        cols = np.concatenate(all_cols)
+        distances = np.concatenate(all_distances)
+
+        # A pair appears twice when both nodes are among each other's neighbors.
+        pairs, first = np.unique(rows * n_nodes + cols, return_index=True)
+        rows, cols, distances = pairs // n_nodes, pairs % n_nodes, distances[first]
+
+        for start in range(0, len(rows), self.chunk_size):
+            end = start + self.chunk_size
+            yield rows[start:end], cols[start:end], 1 / (1 + distances[start:end])
+
+
+def _make_layer_factory(distance_strategy, threshold=None, n_neighbors=None, spatial_index=False):
+    """Chooses the layer factory for the given connection rule."""
+    if spatial_index or n_neighbors is not None:
+        return NeighborLayerFactory(distance_strategy, threshold=threshold, n_neighbors=n_neighbors)
+    return LayerFactory(distance_strategy, threshold)
+
+
+# Attribute matrix mapped by each worker process of `MultiplexNetwork.add_layers`.
+_SHARED_MEMORY = None
+_SHARED_MATRIX = None
+
+
+def _attach_shared_matrix(shm_name, shape, dtype):
+    """Process pool initializer that maps the shared attribute matrix."""
+    global _SHARED_MATRIX, _SHARED_MEMORY
+    _SHARED_MEMORY = shared_memory.SharedMemory(name=shm_name)
+    _SHARED_MATRIX = np.ndarray(shape, dtype=dtype, buffer=_SHARED_MEMORY.buf)
+
+
+def _create_shared_edges(layer_factory, column_positions):
+    """Builds the edges of a layer from the matrix shared with the worker process."""
+    return layer_factory.create_edges(_SHARED_MATRIX[:, column_positions])
+
+
+def _layer_spec(attributes_list, distance_strategy, threshold=None, n_neighbors=None, spatial_index=False):
+    """Returns the normalized arguments a layer is built with."""
+    return {
+        "attributes_list": list(attributes_list),
+        "distance_strategy": distance_strategy,
+        "threshold": threshold,
+        "n_neighbors": n_neighbors,
+        "spatial_index": spatial_index,
+    }
+
+
+def _strategy_fingerprint(distance_strategy):
+    """Describes a distance strategy and its parameters for hashing."""
+    strategy_type = type(distance_strategy)
+    parameters = []
+    for name, value in sorted(vars(distance_strategy).items()):
+        if isinstance(value, np.ndarray):
+            value = f"{value.dtype}{value.shape}{hashlib.sha256(np.ascontiguousarray(value).tobytes()).hexdigest()}"
+        parameters.append(f"{name}={value!r}")
+    return f"{strategy_type.__module__}.{strategy_type.__qualname__}({', '.join(parameters)})"
+
+
+def _layer_cache_key(matrix, nodes, spec):
+    """Hashes everything that determines the edges of a layer.
+
+    The key covers the attribute values, the node names, the attribute list,
+    the strategy with its parameters and the connection rule. Whether a
+    spatial index is used does not change the edges, so it is left out.
+    """
+    digest = hashlib.sha256()
+    digest.update(f"{matrix.dtype}{matrix.shape}".encode())
+    digest.update(np.ascontiguousarray(matrix).tobytes())
+    digest.update("\x1f".join(map(str, nodes)).encode())
+    digest.update(json.dumps(spec["attributes_list"]).encode())
+    digest.update(_strategy_fingerprint(spec["distance_strategy"]).encode())
+    digest.update(f"threshold={spec['threshold']!r};n_neighbors={spec['n_neighbors']!r}".encode())
+    return digest.hexdigest()
+
+
+def _strategy_to_dict(distance_strategy):
+    """Describes a distance strategy as JSON-serializable metadata."""
+    strategy_type = type(distance_strategy)
+    parameters = {
+        name: value.tolist() if isinstance(value, np.ndarray) else value
+        for name, value in vars(distance_strategy).items()
+    }
+    return {"module": strategy_type.__module__, "name": strategy_type.__qualname__, "parameters": parameters}
+
+
+def _strategy_from_dict(metadata):
+    """Rebuilds a distance strategy from its metadata, or returns None if its class cannot be imported."""
+    try:
+        strategy_type = importlib.import_module(metadata["module"])
+        for attribute in metadata["name"].split("."):
+            strategy_type = getattr(strategy_type, attribute)
+    except (ImportError, AttributeError):
+        return None
+
+    distance_strategy = strategy_type.__new__(strategy_type)
+    for name, value in metadata["parameters"].items():
+        setattr(distance_strategy, name, np.asarray(value, dtype=float) if isinstance(value, list) else value)
+    return distance_strategy
+
+
+def _memmap_npz(path):
+    """Maps the arrays of an uncompressed npz file without reading them into memory.
+
+    An uncompressed npz file is a zip archive of .npy files stored
+    contiguously, so each array can be memory-mapped at the offset of its
+    data. Compressed members fall back to a regular read.
+    """
+    arrays = {}
+    with zipfile.ZipFile(path) as archive, open(path, "rb") as f:
+        for info in archive.infolist():
+            name = info.filename[:-len(".npy")]
+            if info.compress_type != zipfile.ZIP_STORED:
+                with archive.open(info) as member:
+                    arrays[name] = np.lib.format.read_array(member)
+                continue
+
+            # Skip the local file header, whose variable-length fields may differ
+            # from the ones in the central directory.
+            f.seek(info.header_offset)
+            local_header = f.read(30)
+            name_length, extra_length = struct.unpack("<HH", local_header[26:30])
+            f.seek(info.header_offset + 30 + name_length + extra_length)
+
+            version = np.lib.format.read_magic(f)
+            if version == (1, 0):
+                shape, fortran_order, dtype = np.lib.format.read_array_header_1_0(f)
+            else:
+                shape, fortran_order, dtype = np.lib.format.read_array_header_2_0(f)
+
+            if dtype.hasobject or 0 in shape:
+                f.seek(info.header_offset + 30 + name_length + extra_length)
+                arrays[name] = np.lib.format.read_array(f, allow_pickle=False)
+            else:
+                arrays[name] = np.memmap(
+                    path, dtype=dtype, mode="r", shape=shape, offset=f.tell(),
+                    order="F" if fortran_order else "C",
+                )
+    return arrays
+
+
+def _edges_to_adjacency(rows, cols, weights, n_nodes):
+    """Builds a symmetric CSR adjacency matrix from upper-triangle edges."""
+    return sparse.csr_matrix(
+        (np.concatenate([weights, weights]), (np.concatenate([rows, cols]), np.concatenate([cols, rows]))),
+        shape=(n_nodes, n_nodes),
+    )
+
+
+def _adjacency_to_edges(adjacency):
+    """Returns the upper-triangle edges of a symmetric adjacency matrix sorted by row and column."""
+    upper = sparse.triu(adjacency, k=1, format="coo")
+    order = np.lexsort((upper.col, upper.row))
+    return upper.row[order], upper.col[order], upper.data[order]
+
 
 class MultiplexNetwork:
     """Main class that manages the multiplex network and its layers.
@@ -84,17 +768,38 @@ class MultiplexNetwork:
     This class handles the creation and management of multiple network layers,
     each representing different neighborhood attributes.
 
+    With the "sparse" backend each layer is kept as a CSR adjacency matrix over
+    the shared node index in `nodes`, and the networkx graph is only built
+    when it is requested through `get_layer` or `get_multiplex_layers`.
+
     Attributes:
         barrios_data (pd.DataFrame): DataFrame containing neighborhood data.
-        layers (dict): Dictionary storing the network layers.
+        nodes (np.ndarray): Node names, in the order used by the adjacency matrices.
+        backend (str): Either "networkx" or "sparse".
+        layers (dict): Dictionary storing the network layers. With the sparse
+            backend it only holds the layers already converted to networkx.
+        adjacency (dict): Dictionary storing the CSR adjacency matrix of each
+            layer when using the sparse backend.
+        layer_specs (dict): Arguments each layer was built with, used to patch
+            the layers when nodes change.
+        cache_dir (Path): Directory where computed layers are cached, keyed
+            by a hash of their data and arguments. None disables the cache.
     """
 
-    def __init__(self, barrios_data, node_column_name):
+    def __init__(self, barrios_data, node_column_name, backend="networkx", cache_dir=None):
+        if backend not in ("networkx", "sparse"):
+            raise ValueError(f"Unknown backend '{backend}'. Use 'networkx' or 'sparse'.")
         self.barrios_data = barrios_data
         self.node_column_name = node_column_name
+        self.backend = backend
+        self.cache_dir = None if cache_dir is None else Path(cache_dir)
+        self.nodes = barrios_data[node_column_name].to_numpy()
         self.layers = {}
+        self.adjacency = {}
+        self.layer_specs = {}
 
-    def add_layer(self, layer_name, attributes_list, distance_strategy, threshold):
+    def add_layer(self, layer_name, attributes_list, distance_strategy, threshold=None, n_neighbors=None,
+                  spatial_index=False):
         """Adds a layer to the multiplex network for a list of attributes.
 
         Args:
@@ -102,10 +807,467 @@ class MultiplexNetwork:
             attributes_list (list): List of attribute column names to form the vector.
             distance_strategy (DistanceStrategy): Strategy for calculating distances.
             threshold (float): Connection threshold.
+            n_neighbors (int): If set, connects each node to its k nearest
+                neighbors instead of using a global threshold.
+            spatial_index (bool): If True, finds the pairs within the threshold
+                with a KD-tree instead of a dense distance matrix. Recommended
+                for tens of thousands of nodes.
+        """
+        layer_factory = _make_layer_factory(distance_strategy, threshold, n_neighbors, spatial_index)
+        self.layer_specs[layer_name] = _layer_spec(
+            attributes_list, distance_strategy, threshold, n_neighbors, spatial_index
+        )
+
+        if self.backend == "networkx" and self.cache_dir is None:
+            layer_graph = layer_factory.create_layer(self.barrios_data, attributes_list, self.node_column_name)
+            self.layers[layer_name] = layer_graph
+        else:
+            self._rebuild_layer(layer_name)
+
+    def add_layers(self, layer_specs, max_workers=None, executor="thread"):
+        """Builds several layers concurrently and adds them to the multiplex network.
+
+        The attributes of all layers are extracted once into a single matrix
+        that is shared with the workers: threads read it directly and worker
+        processes map it from shared memory, so the DataFrame is never
+        pickled. Layers are stored in the order of `layer_specs` regardless of
+        the order in which they finish.
+
+        Args:
+            layer_specs (dict): Mapping from layer name to the keyword arguments
+                of `add_layer` (`attributes_list`, `distance_strategy`,
+                `threshold`, `n_neighbors`, `spatial_index`).
+            max_workers (int): Maximum number of workers. Defaults to the
+                executor's own default.
+            executor (str): "thread" (default), suited to the vectorized
+                strategies that release the GIL, or "process", suited to custom
+                strategies that compute distances in pure Python.
+        """
+        if executor not in ("thread", "process"):
+            raise ValueError(f"Unknown executor '{executor}'. Use 'thread' or 'process'.")
+
+        layer_specs = {layer_name: _layer_spec(**spec) for layer_name, spec in layer_specs.items()}
+        columns = list(dict.fromkeys(
+            column for spec in layer_specs.values() for column in spec["attributes_list"]
+        ))
+        column_index = pd.Index(columns)
+        matrix = np.ascontiguousarray(self.barrios_data[columns].to_numpy(dtype=float))
+
+        results, cache_keys, tasks = {}, {}, {}
+        for layer_name, spec in layer_specs.items():
+            column_positions = column_index.get_indexer(spec["attributes_list"])
+            if self.cache_dir is not None:
+                cache_keys[layer_name] = _layer_cache_key(matrix[:, column_positions], self.nodes, spec)
+                cached_edges = self._load_cached_edges(cache_keys[layer_name])
+                if cached_edges is not None:
+                    results[layer_name] = cached_edges
+                    continue
+
+            layer_factory = _make_layer_factory(
+                spec["distance_strategy"], spec["threshold"], spec["n_neighbors"], spec["spatial_index"]
+            )
+            tasks[layer_name] = (layer_factory, column_positions)
+
+        if tasks and executor == "thread":
+            with ThreadPoolExecutor(max_workers=max_workers) as pool:
+                futures = {
+                    layer_name: pool.submit(layer_factory.create_edges, matrix[:, column_positions])
+                    for layer_name, (layer_factory, column_positions) in tasks.items()
+                }
+                results.update((layer_name, future.result()) for layer_name, future in futures.items())
+        elif tasks:
+            shm = shared_memory.SharedMemory(create=True, size=max(matrix.nbytes, 1))
+            try:
+                np.ndarray(matrix.shape, dtype=matrix.dtype, buffer=shm.buf)[:] = matrix
+                with ProcessPoolExecutor(
+                    max_workers=max_workers,
+                    initializer=_attach_shared_matrix,
+                    initargs=(shm.name, matrix.shape, matrix.dtype),
+                ) as pool:
+                    futures = {
+                        layer_name: pool.submit(_create_shared_edges, layer_factory, column_positions)
+                        for layer_name, (layer_factory, column_positions) in tasks.items()
+                    }
+                    results.update((layer_name, future.result()) for layer_name, future in futures.items())
+            finally:
+                shm.close()
+                shm.unlink()
+
+        for layer_name, spec in layer_specs.items():
+            if layer_name in tasks and self.cache_dir is not None:
+                self._save_cached_edges(cache_keys[layer_name], results[layer_name])
+            self.layer_specs[layer_name] = spec
+            self._store_edges(layer_name, *results[layer_name])
+
+    def threshold_sweep(self, attributes_list, distance_strategy, thresholds):
+        """Summarizes the layer that each threshold would produce.
+
+        Distances are computed once and the layer is grown edge by edge as the
+        threshold rises, so a sweep over many thresholds costs a single pass.
+        Unlike the layers returned by `add_layer`, the statistics account for
+        every node, including the ones left without edges.
+
+        Args:
+            attributes_list (list): List of attribute column names to form the vector.
+            distance_strategy (DistanceStrategy): Strategy for calculating distances.
+            thresholds (iterable): Thresholds to evaluate.
+
+        Returns:
+            pd.DataFrame: Number of edges, density, number of connected
+                components and average clustering coefficient per threshold.
+        """
+        matrix = self.barrios_data[attributes_list].to_numpy(dtype=float)
+        n_nodes = len(matrix)
+        n_pairs = n_nodes * (n_nodes - 1) / 2
+
+        layer_graph = nx.Graph()
+        layer_graph.add_nodes_from(range(n_nodes))
+        parents = np.arange(n_nodes)
+        n_components = n_nodes
+
+        def find(node):
+            while parents[node] != node:
+                parents[node] = parents[parents[node]]
+                node = parents[node]
+            return node
+
+        summary = []
+        for threshold, rows, cols, distances in LayerFactory.sweep_edges(distance_strategy, matrix, thresholds):
+            layer_graph.add_weighted_edges_from(zip(rows.tolist(), cols.tolist(), 1 / (1 + distances)))
+            for row, col in zip(rows, cols):
+                root_row, root_col = find(row), find(col)
+                if root_row != root_col:
+                    parents[root_row] = root_col
+                    n_components -= 1
+
+            n_edges = layer_graph.number_of_edges()
+            summary.append({
+                "threshold": threshold,
+                "edges": n_edges,
+                "density": n_edges / n_pairs if n_pairs else 0.0,
+                "components": n_components,
+                "average_clustering": nx.average_clustering(layer_graph) if n_nodes else 0.0,
+            })
+
+        return pd.DataFrame(summary, columns=["threshold", "edges", "density", "components", "average_clustering"])
+
+    def sweep_layers(self, attributes_list, distance_strategy, thresholds):
+        """Builds the layer for each threshold reusing a single distance matrix.
+
+        Args:
+            attributes_list (list): List of attribute column names to form the vector.
+            distance_strategy (DistanceStrategy): Strategy for calculating distances.
+            thresholds (iterable): Thresholds to evaluate.
+
+        Returns:
+            dict: Mapping from threshold to the `nx.Graph` that `add_layer`
+                would build with it.
         """
-        layer_factory = LayerFactory(distance_strategy, threshold)
-        layer_graph = layer_factory.create_layer(self.barrios_data, attributes_list, self.node_column_name)
-        self.layers[layer_name] = layer_graph
+        matrix = self.barrios_data[attributes_list].to_numpy(dtype=float)
+
+        layers = {}
+        all_rows, all_cols, all_distances = [], [], []
+        for threshold, rows, cols, distances in LayerFactory.sweep_edges(distance_strategy, matrix, thresholds):
+            all_rows.append(rows)
+            all_cols.append(cols)
+            all_distances.append(distances)
+
+            rows, cols, distances = (np.concatenate(parts) for parts in (all_rows, all_cols, all_distances))
+            order = np.lexsort((cols, rows))
+
+            layer_graph = nx.Graph()
+            layer_graph.add_weighted_edges_from(
+                zip(self.nodes[rows[order]], self.nodes[cols[order]], 1 / (1 + distances[order]))
+            )
+            layers[threshold] = layer_graph
+        return layers
+
+    def save(self, path):
+        """Saves all layers, the node index and the layer metadata into a single file.
+
+        The bundle is an uncompressed npz archive holding the CSR arrays of
+        every layer, the node names, the attribute columns used by the layers
+        and a JSON metadata record, so it can be memory-mapped by `load`.
+
+        Args:
+            path (str): Path of the file to write, usually ending in ".npz".
+        """
+        columns = list(dict.fromkeys(
+            column for spec in self.layer_specs.values() for column in spec["attributes_list"]
+        ))
+        nodes = self.nodes.astype(str) if self.nodes.dtype == object else self.nodes
+        arrays = {"nodes": nodes}
+        for position, column in enumerate(columns):
+            arrays[f"columns/{position}"] = self.barrios_data[column].to_numpy()
+
+        layers_metadata = []
+        for position, layer_name in enumerate(self.layer_names):
+            adjacency = self.get_adjacency(layer_name).tocsr()
+            arrays[f"layers/{position}/data"] = adjacency.data
+            arrays[f"layers/{position}/indices"] = adjacency.indices
+            arrays[f"layers/{position}/indptr"] = adjacency.indptr
+
+            spec = self.layer_specs[layer_name]
+            layers_metadata.append({
+                "name": layer_name,
+                "attributes_list": spec["attributes_list"],
+                "distance_strategy": _strategy_to_dict(spec["distance_strategy"]),
+                "threshold": spec["threshold"],
+                "n_neighbors": spec["n_neighbors"],
+                "spatial_index": spec["spatial_index"],
+            })
+
+        metadata = {"node_column_name": self.node_column_name, "columns": columns, "layers": layers_metadata}
+        arrays["metadata"] = np.frombuffer(json.dumps(metadata).encode(), dtype=np.uint8)
+
+        path = Path(path)
+        temp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+        with open(temp_path, "wb") as f:
+            np.savez(f, **arrays)
+        os.replace(temp_path, path)
+
+    @classmethod
+    def load(cls, path, backend="sparse", mmap=True, cache_dir=None):
+        """Loads a multiplex network saved with `save`.
+
+        With `mmap` the arrays are memory-mapped from the file instead of
+        read, and with the sparse backend the adjacency matrices are built on
+        top of them without copying, so opening a large multiplex does not
+        parse its edges. `barrios_data` only contains the node column and the
+        attribute columns used by the layers.
+
+        Args:
+            path (str): Path of the file written by `save`.
+            backend (str): Either "networkx" or "sparse".
+            mmap (bool): If True, memory-maps the arrays instead of reading them.
+            cache_dir (str): Directory for the layer cache of the loaded network.
+
+        Returns:
+            MultiplexNetwork: The loaded multiplex network.
+        """
+        if mmap:
+            arrays = _memmap_npz(path)
+        else:
+            with np.load(path) as bundle:
+                arrays = dict(bundle)
+        metadata = json.loads(bytes(arrays["metadata"]).decode())
+
+        barrios_data = pd.DataFrame({metadata["node_column_name"]: arrays["nodes"]})
+        for position, column in enumerate(metadata["columns"]):
+            barrios_data[column] = arrays[f"columns/{position}"]
+
+        multiplex = cls(barrios_data, metadata["node_column_name"], backend=backend, cache_dir=cache_dir)
+        n_nodes = len(multiplex.nodes)
+        for position, layer_metadata in enumerate(metadata["layers"]):
+            layer_name = layer_metadata["name"]
+            multiplex.layer_specs[layer_name] = _layer_spec(
+                layer_metadata["attributes_list"],
+                _strategy_from_dict(layer_metadata["distance_strategy"]),
+                layer_metadata["threshold"],
+                layer_metadata["n_neighbors"],
+                layer_metadata["spatial_index"],
+            )
+            adjacency = sparse.csr_matrix(
+                (
+                    arrays[f"layers/{position}/data"],
+                    arrays[f"layers/{position}/indices"],
+                    arrays[f"layers/{position}/indptr"],
+                ),
+                shape=(n_nodes, n_nodes),
+                copy=False,
+            )
+            if backend == "sparse":
+                multiplex.adjacency[layer_name] = adjacency
+            else:
+                multiplex._store_edges(layer_name, *_adjacency_to_edges(adjacency))
+        return multiplex
+
+    def update_nodes(self, updated_data):
+        """Updates the attributes of existing nodes and patches every layer.
+
+        Only the distances between the updated nodes and the rest are
+        recomputed, so updating k nodes costs O(k·n) per layer. kNN layers and
+        layers whose strategy estimates its parameters from the data are
+        rebuilt, since a change in one node can alter any of their edges.
+
+        Args:
+            updated_data (pd.DataFrame): Rows with the node column and the
+                attribute columns to overwrite.
+
+        Raises:
+            KeyError: If a node does not exist in the network.
+        """
+        positions = self._node_positions(updated_data[self.node_column_name])
+        new_values = updated_data.set_index(self.node_column_name)
+
+        barrios_data = self.barrios_data.copy()
+        is_updated = barrios_data[self.node_column_name].isin(new_values.index)
+        for column in new_values.columns:
+            barrios_data[column] = barrios_data[column].mask(
+                is_updated, barrios_data[self.node_column_name].map(new_values[column])
+            )
+        self.barrios_data = barrios_data
+
+        for layer_name in self.layer_names:
+            self._patch_layer(layer_name, positions)
+
+    def add_nodes(self, new_data):
+        """Adds new nodes to the network and connects them in every layer.
+
+        Args:
+            new_data (pd.DataFrame): Rows with the node column and the
+                attributes used by the layers.
+
+        Raises:
+            ValueError: If a node already exists in the network.
+        """
+        new_nodes = new_data[self.node_column_name].to_numpy()
+        if pd.Index(self.nodes).isin(new_nodes).any():
+            raise ValueError("Some of the nodes already exist in the network. Use update_nodes instead.")
+
+        n_old = len(self.nodes)
+        self.barrios_data = pd.concat([self.barrios_data, new_data], ignore_index=True)
+        self.nodes = self.barrios_data[self.node_column_name].to_numpy()
+        for layer_name, adjacency in self.adjacency.items():
+            adjacency = adjacency.copy()
+            adjacency.resize((len(self.nodes), len(self.nodes)))
+            self.adjacency[layer_name] = adjacency
+
+        positions = np.arange(n_old, len(self.nodes))
+        for layer_name in self.layer_names:
+            self._patch_layer(layer_name, positions)
+
+    def remove_nodes(self, node_names):
+        """Removes nodes and their edges from every layer.
+
+        Args:
+            node_names (list): Names of the nodes to remove.
+
+        Raises:
+            KeyError: If a node does not exist in the network.
+        """
+        keep = np.ones(len(self.nodes), dtype=bool)
+        keep[self._node_positions(node_names)] = False
+
+        removed = self.nodes[~keep]
+        self.barrios_data = self.barrios_data[keep]
+        self.nodes = self.nodes[keep]
+        for layer_name, adjacency in self.adjacency.items():
+            self.adjacency[layer_name] = adjacency[keep][:, keep]
+        for layer_graph in self.layers.values():
+            former_neighbors = {neighbor for node in removed if node in layer_graph for neighbor in layer_graph[node]}
+            layer_graph.remove_nodes_from(removed)
+            layer_graph.remove_nodes_from(
+                [node for node in former_neighbors if node in layer_graph and layer_graph.degree(node) == 0]
+            )
+
+        for layer_name in self.layer_names:
+            if self._requires_rebuild(layer_name):
+                self._rebuild_layer(layer_name)
+
+    def _node_positions(self, node_names):
+        """Returns the positions of the given nodes in the node index."""
+        positions = pd.Index(self.nodes).get_indexer(node_names)
+        if (positions < 0).any():
+            missing = [name for name, position in zip(node_names, positions) if position < 0]
+            raise KeyError(f"Nodes not found in the network: {missing}")
+        return positions
+
+    def _requires_rebuild(self, layer_name):
+        """Tells whether a layer has to be rebuilt instead of patched."""
+        spec = self.layer_specs[layer_name]
+        return spec["n_neighbors"] is not None or getattr(spec["distance_strategy"], "data_dependent", False)
+
+    def _rebuild_layer(self, layer_name):
+        """Rebuilds a layer from scratch with its stored spec, reusing the cache when possible."""
+        spec = self.layer_specs[layer_name]
+        matrix = self.barrios_data[spec["attributes_list"]].to_numpy(dtype=float)
+
+        cache_key = None if self.cache_dir is None else _layer_cache_key(matrix, self.nodes, spec)
+        edges = None if cache_key is None else self._load_cached_edges(cache_key)
+        if edges is None:
+            layer_factory = _make_layer_factory(
+                spec["distance_strategy"], spec["threshold"], spec["n_neighbors"], spec["spatial_index"]
+            )
+            edges = layer_factory.create_edges(matrix)
+            if cache_key is not None:
+                self._save_cached_edges(cache_key, edges)
+        self._store_edges(layer_name, *edges)
+
+    def _load_cached_edges(self, cache_key):
+        """Loads the edges stored under a cache key, or None if they are not cached."""
+        cache_path = self.cache_dir / f"{cache_key}.npz"
+        if not cache_path.exists():
+            return None
+        with np.load(cache_path) as cached:
+            return cached["rows"], cached["cols"], cached["weights"]
+
+    def _save_cached_edges(self, cache_key, edges):
+        """Stores the edges of a layer under a cache key."""
+        rows, cols, weights = edges
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        cache_path = self.cache_dir / f"{cache_key}.npz"
+
+        # Write to a temporary file first so a reader never sees a partial file.
+        temp_path = cache_path.with_suffix(f".{os.getpid()}.tmp")
+        with open(temp_path, "wb") as f:
+            np.savez(f, rows=rows.astype(np.int64), cols=cols.astype(np.int64), weights=weights)
+        os.replace(temp_path, cache_path)
+
+    def _patch_layer(self, layer_name, positions):
+        """Recomputes the edges of the given node positions in a threshold layer."""
+        if self._requires_rebuild(layer_name):
+            self._rebuild_layer(layer_name)
+            return
+
+        spec = self.layer_specs[layer_name]
+        matrix = self.barrios_data[spec["attributes_list"]].to_numpy(dtype=float)
+        distances = cross_distances(spec["distance_strategy"], matrix[positions], matrix)
+
+        rows, cols = np.nonzero(distances <= spec["threshold"])
+        rows, cols, distances = positions[rows], cols, distances[rows, cols]
+
+        # Keep each pair once, also when both ends are among the patched nodes.
+        is_patched = np.zeros(len(self.nodes), dtype=bool)
+        is_patched[positions] = True
+        keep = (rows != cols) & (~is_patched[cols] | (rows < cols))
+        rows, cols, weights = rows[keep], cols[keep], 1 / (1 + distances[keep])
+
+        if self.backend == "sparse":
+            adjacency = self.adjacency[layer_name].tocoo()
+            untouched = ~(is_patched[adjacency.row] | is_patched[adjacency.col])
+            self.adjacency[layer_name] = sparse.csr_matrix(
+                (
+                    np.concatenate([adjacency.data[untouched], weights, weights]),
+                    (
+                        np.concatenate([adjacency.row[untouched], rows, cols]),
+                        np.concatenate([adjacency.col[untouched], cols, rows]),
+                    ),
+                ),
+                shape=adjacency.shape,
+            )
+            self.layers.pop(layer_name, None)
+        else:
+            layer_graph = self.layers[layer_name]
+            patched_nodes = [node for node in self.nodes[positions] if node in layer_graph]
+            former_neighbors = {neighbor for node in patched_nodes for neighbor in layer_graph[node]}
+            layer_graph.remove_edges_from(list(layer_graph.edges(patched_nodes)))
+            layer_graph.add_weighted_edges_from(zip(self.nodes[rows], self.nodes[cols], weights))
+
+            # Layers only contain connected nodes, as in `LayerFactory.create_layer`.
+            layer_graph.remove_nodes_from(
+                [node for node in former_neighbors.union(patched_nodes) if layer_graph.degree(node) == 0]
+            )
+
+    def _store_edges(self, layer_name, rows, cols, weights):
+        """Stores a layer given its edges as node positions."""
+        if self.backend == "sparse":
+            self.adjacency[layer_name] = _edges_to_adjacency(rows, cols, weights, len(self.nodes))
+            self.layers.pop(layer_name, None)
+        else:
+            layer_graph = nx.Graph()
+            layer_graph.add_weighted_edges_from(zip(self.nodes[rows], self.nodes[cols], weights))
+            self.layers[layer_name] = layer_graph
 
     def get_layer(self, attribute_column):
         """Retrieves a specific layer from the multiplex network.
@@ -116,6 +1278,11 @@ class MultiplexNetwork:
         Returns:
             nx.Graph: The requested network layer, or None if not found.
         """
+        if attribute_column not in self.layers and attribute_column in self.adjacency:
+            rows, cols, weights = _adjacency_to_edges(self.adjacency[attribute_column])
+            layer_graph = nx.Graph()
+            layer_graph.add_weighted_edges_from(zip(self.nodes[rows], self.nodes[cols], weights))
+            self.layers[attribute_column] = layer_graph
         return self.layers.get(attribute_column, None)
 
     def get_multiplex_layers(self):
@@ -124,4 +1291,119 @@ class MultiplexNetwork:
         Returns:
             dict: Dictionary containing all network layers.
         """
-        return self.layers
+        return {layer_name: self.get_layer(layer_name) for layer_name in self.layer_names}
+
+    @property
+    def layer_names(self):
+        """list: Names of the layers, in insertion order."""
+        if self.backend == "sparse":
+            return list(self.adjacency)
+        return list(self.layers)
+
+    def get_adjacency(self, layer_name):
+        """Returns the adjacency matrix of a layer over the shared node index.
+
+        Args:
+            layer_name (str): Name of the layer.
+
+        Returns:
+            sparse.csr_matrix: Symmetric weighted adjacency matrix, with rows
+                and columns ordered like `nodes`.
+        """
+        if self.backend == "sparse":
+            return self.adjacency[layer_name]
+
+        layer_graph = self.layers[layer_name]
+        node_index = pd.Index(self.nodes)
+        edges = list(layer_graph.edges(data="weight", default=1.0))
+        if not edges:
+            return sparse.csr_matrix((len(self.nodes), len(self.nodes)))
+        sources, targets, weights = zip(*edges)
+        return _edges_to_adjacency(
+            node_index.get_indexer(sources), node_index.get_indexer(targets), np.asarray(weights, dtype=float),
+            len(self.nodes),
+        )
+
+    def aggregate_adjacency(self, layer_names=None):
+        """Sums the weighted adjacency matrices of several layers.
+
+        Args:
+            layer_names (list): Layers to aggregate. Defaults to all layers.
+
+        Returns:
+            sparse.csr_matrix: Aggregated weighted adjacency matrix.
+        """
+        return sum(
+            (self.get_adjacency(name) for name in self._resolve_layer_names(layer_names)),
+            sparse.csr_matrix((len(self.nodes), len(self.nodes))),
+        )
+
+    def edge_overlap(self, layer_names=None):
+        """Counts in how many layers each pair of nodes is connected.
+
+        Args:
+            layer_names (list): Layers to compare. Defaults to all layers.
+
+        Returns:
+            sparse.csr_matrix: Matrix with the number of layers containing each edge.
+        """
+        return sum(
+            ((self.get_adjacency(name) != 0).astype(np.int64) for name in self._resolve_layer_names(layer_names)),
+            sparse.csr_matrix((len(self.nodes), len(self.nodes)), dtype=np.int64),
+        )
+
+    def overlay_adjacency(self, layer_names=None):
+        """Returns the binary adjacency of the union of several layers.
+
+        Args:
+            layer_names (list): Layers to overlay. Defaults to all layers.
+
+        Returns:
+            sparse.csr_matrix: Matrix with 1 where an edge exists in any layer.
+        """
+        overlap = self.edge_overlap(layer_names)
+        overlap.data = np.ones_like(overlap.data)
+        return overlap
+
+    def multiplex_degree(self, layer_names=None):
+        """Computes the degree of every node in each layer.
+
+        Args:
+            layer_names (list): Layers to include. Defaults to all layers.
+
+        Returns:
+            pd.DataFrame: Degree per layer, indexed by node name.
+        """
+        layer_names = self._resolve_layer_names(layer_names)
+        degrees = {name: self.get_adjacency(name).getnnz(axis=1) for name in layer_names}
+        return pd.DataFrame(degrees, index=pd.Index(self.nodes, name=self.node_column_name), columns=layer_names)
+
+    def participation_coefficient(self, layer_names=None):
+        """Computes how evenly the edges of every node are spread across layers.
+
+        The coefficient is 1 when a node has the same degree in every layer and
+        0 when all its edges belong to a single layer (or it has none).
+
+        Args:
+            layer_names (list): Layers to include. Defaults to all layers.
+
+        Returns:
+            pd.Series: Participation coefficient, indexed by node name.
+        """
+        degrees = self.multiplex_degree(layer_names).to_numpy(dtype=float)
+        n_layers = degrees.shape[1]
+        overlapping_degree = degrees.sum(axis=1)
+
+        coefficient = np.zeros(len(degrees))
+        if n_layers > 1:
+            connected = overlapping_degree > 0
+            shares = degrees[connected] / overlapping_degree[connected, None]
+            coefficient[connected] = n_layers / (n_layers - 1) * (1 - (shares ** 2).sum(axis=1))
+
+        return pd.Series(
+            coefficient, index=pd.Index(self.nodes, name=self.node_column_name), name="participation_coefficient"
+        )
+
+    def _resolve_layer_names(self, layer_names):
+        """Returns the given layer names, or all of them when None."""
+        return self.layer_names if layer_names is None else list(layer_names)
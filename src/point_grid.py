@@ -0,0 +1,236 @@
+import geopandas as gpd
+import numpy as np
+import pandas as pd
+import shapely
+from pyproj import CRS
+from scipy import ndimage, sparse
+
+from src.geo_data_handler import GeoDataHandler, UTM_CRS
+
+
+GRID_KINDS = ('square', 'hex')
+
+
+class PointGrid:
+    """Regular square or hexagonal grid in projected coordinates
+
+    Points are assigned to cells with integer arithmetic on their coordinates,
+    so counting and smoothing a point layer never needs a spatial join. Cell
+    values are 2D arrays of shape (n_rows, n_cols); hexagons use odd-row
+    offset coordinates so they fit in the same layout.
+    """
+
+    def __init__(self, bounds: tuple, cell_size: float, kind: str = 'square', crs=UTM_CRS):
+        if kind not in GRID_KINDS:
+            raise ValueError(f'Unknown grid kind {kind!r}, expected one of {GRID_KINDS}')
+        self.kind = kind
+        self.cell_size = float(cell_size)
+        self.crs = CRS.from_user_input(crs)
+        minx, miny, maxx, maxy = bounds
+
+        if kind == 'square':
+            self.origin = (minx, miny)
+            # One extra cell so points on the upper bounds stay inside
+            self.shape = (
+                int(np.floor((maxy - miny) / self.cell_size)) + 1,
+                int(np.floor((maxx - minx) / self.cell_size)) + 1,
+            )
+        else:
+            # cell_size is the distance between neighbouring centres (flat-to-flat width)
+            self.radius = self.cell_size / np.sqrt(3)
+            # Pad one cell on each side so points on the border round into the grid
+            self.origin = (minx - self.cell_size, miny - self.cell_size)
+            self.shape = (
+                int(np.ceil((maxy - miny + 2 * self.cell_size) / (1.5 * self.radius))) + 1,
+                int(np.ceil((maxx - minx + 2 * self.cell_size) / self.cell_size)) + 1,
+            )
+
+    @classmethod
+    def from_layer(cls, layer, cell_size: float, kind: str = 'square', crs=UTM_CRS, padding: float = 0.0):
+        """Grid covering the bounds of a layer (GeoDataFrame or GeoDataHandler) in crs
+
+        padding extends the bounds on every side, in crs units; use about three
+        times the density bandwidth so the kernel mass near the border stays on the grid.
+        """
+        minx, miny, maxx, maxy = _layer_geometry(layer, crs).total_bounds
+        bounds = (minx - padding, miny - padding, maxx + padding, maxy + padding)
+        return cls(bounds, cell_size, kind=kind, crs=crs)
+
+    @property
+    def n_cells(self):
+        return self.shape[0] * self.shape[1]
+
+    @property
+    def cell_area(self):
+        if self.kind == 'square':
+            return self.cell_size ** 2
+        return 1.5 * np.sqrt(3) * self.radius ** 2
+
+    def cell_ids(self, points):
+        """Flat cell id of every point (-1 for points outside the grid)"""
+        geometry = _layer_geometry(points, self.crs)
+        x = geometry.x.to_numpy() - self.origin[0]
+        y = geometry.y.to_numpy() - self.origin[1]
+
+        if self.kind == 'square':
+            rows = np.floor(y / self.cell_size).astype(np.int64)
+            cols = np.floor(x / self.cell_size).astype(np.int64)
+        else:
+            rows, cols = self._hex_cells(x, y)
+
+        inside = (rows >= 0) & (rows < self.shape[0]) & (cols >= 0) & (cols < self.shape[1])
+        return np.where(inside, rows * self.shape[1] + cols, -1)
+
+    def _hex_cells(self, x, y):
+        """Round coordinates to pointy-top hexagons and return their odd-row offset coordinates"""
+        q = (np.sqrt(3) / 3 * x - y / 3) / self.radius
+        r = 2 / 3 * y / self.radius
+        s = -q - r
+
+        # Cube rounding: fix the coordinate with the largest rounding error
+        rq, rr, rs = np.round(q), np.round(r), np.round(s)
+        dq, dr, ds = np.abs(rq - q), np.abs(rr - r), np.abs(rs - s)
+        fix_q = (dq > dr) & (dq > ds)
+        fix_r = ~fix_q & (dr > ds)
+        rq = np.where(fix_q, -rr - rs, rq)
+        rr = np.where(fix_r, -rq - rs, rr)
+
+        rows = rr.astype(np.int64)
+        cols = rq.astype(np.int64) + (rows - (rows & 1)) // 2
+        return rows, cols
+
+    def counts(self, points, category_column: str = None, weight_column: str = None):
+        """Count (or sum weight_column of) points per cell, per category if category_column is given"""
+        cell_ids = self.cell_ids(points)
+        inside = cell_ids >= 0
+        weights = None if weight_column is None else points[weight_column].to_numpy(dtype=float)[inside]
+
+        if category_column is None:
+            return self._bincount(cell_ids[inside], weights)
+
+        category_codes, categories = pd.factorize(points[category_column].to_numpy()[inside], sort=True)
+        return {
+            category: self._bincount(
+                cell_ids[inside][category_codes == position],
+                None if weights is None else weights[category_codes == position],
+            )
+            for position, category in enumerate(categories)
+        }
+
+    def _bincount(self, cell_ids, weights=None):
+        return np.bincount(cell_ids, weights=weights, minlength=self.n_cells).reshape(self.shape)
+
+    def density(self, points, bandwidth: float, category_column: str = None, weight_column: str = None):
+        """Gaussian kernel density (points per unit area) with bandwidth in crs units
+
+        The kernel is applied to the cell counts, so the cost depends on the
+        number of cells and not on the number of points. Mass spreading past
+        the grid edge is lost, which under-counts hot spots near the border
+        unless the grid is padded (see `from_layer`).
+        """
+        if self.kind != 'square':
+            raise ValueError('Kernel density is only available on square grids')
+        counts = self.counts(points, category_column=category_column, weight_column=weight_column)
+        if isinstance(counts, dict):
+            return {category: self._smooth(values, bandwidth) for category, values in counts.items()}
+        return self._smooth(counts, bandwidth)
+
+    def _smooth(self, counts, bandwidth):
+        smoothed = ndimage.gaussian_filter(counts.astype(float), sigma=bandwidth / self.cell_size, mode='constant')
+        return smoothed / self.cell_area
+
+    def cell_centers(self):
+        """x and y coordinates of every cell centre, as (n_rows, n_cols) arrays"""
+        rows, cols = np.indices(self.shape)
+        if self.kind == 'square':
+            x = (cols + 0.5) * self.cell_size
+            y = (rows + 0.5) * self.cell_size
+        else:
+            x = (cols + 0.5 * (rows & 1)) * self.cell_size
+            y = rows * 1.5 * self.radius
+        return x + self.origin[0], y + self.origin[1]
+
+    def cell_polygons(self, cell_ids=None):
+        """Polygons of the given flat cell ids (all cells by default)"""
+        x, y = (centres.ravel() for centres in self.cell_centers())
+        if cell_ids is not None:
+            x, y = x[cell_ids], y[cell_ids]
+
+        if self.kind == 'square':
+            half = self.cell_size / 2
+            return shapely.box(x - half, y - half, x + half, y + half)
+
+        angles = np.deg2rad(30 + 60 * np.arange(7))
+        rings = np.stack([
+            x[:, None] + self.radius * np.cos(angles),
+            y[:, None] + self.radius * np.sin(angles),
+        ], axis=-1)
+        return shapely.polygons(rings)
+
+    def to_geodataframe(self, values, drop_empty: bool = True):
+        """GeoDataFrame of grid cells with one column per array in values (a dict or a single array)"""
+        if not isinstance(values, dict):
+            values = {'value': values}
+        columns = {name: np.asarray(array).ravel() for name, array in values.items()}
+
+        cell_ids = np.arange(self.n_cells)
+        if drop_empty:
+            cell_ids = cell_ids[np.any([array != 0 for array in columns.values()], axis=0)]
+
+        rows, cols = np.divmod(cell_ids, self.shape[1])
+        cells = gpd.GeoDataFrame(
+            {'row': rows, 'col': cols} | {name: array[cell_ids] for name, array in columns.items()},
+            geometry=self.cell_polygons(cell_ids), crs=self.crs, index=pd.Index(cell_ids, name='cell_id'),
+        )
+        return cells
+
+    def zone_weights(self, points, zone_column: str):
+        """Share of the points of every cell that falls in each zone
+
+        Returns a sparse (n_cells, n_zones) matrix and the zone index. Zones
+        come from a column the points already carry (e.g. their comuna), so
+        the grid is linked to the zones without a spatial join.
+        """
+        cell_ids = self.cell_ids(points)
+        zones = points[zone_column].to_numpy()
+        assigned = (cell_ids >= 0) & pd.notna(zones)
+        zone_codes, zone_index = pd.factorize(zones[assigned], sort=True)
+
+        cell_zone = sparse.csr_matrix(
+            (np.ones(assigned.sum()), (cell_ids[assigned], zone_codes)),
+            shape=(self.n_cells, len(zone_index)),
+        )
+        cell_totals = np.asarray(cell_zone.sum(axis=1)).ravel()
+        with np.errstate(divide='ignore'):
+            scale = sparse.diags(np.where(cell_totals > 0, 1 / cell_totals, 0.0))
+        return (scale @ cell_zone).tocsr(), pd.Index(zone_index, name=zone_column)
+
+    def rollup(self, values, points, zone_column: str, category_column: str = None):
+        """Re-aggregate cell values to zones, splitting each cell by the zones of its points
+
+        values is an array or a dict of arrays per category; with category_column
+        each category is split by the zones of its own points. Counts roll up
+        exactly to the per-zone counts; smoothed surfaces only keep the mass of
+        cells that contain points.
+        """
+        if not isinstance(values, dict):
+            weights, zone_index = self.zone_weights(points, zone_column)
+            return pd.Series(weights.T @ np.asarray(values).ravel(), index=zone_index)
+
+        zone_index = pd.Index(np.sort(points[zone_column].dropna().unique()), name=zone_column)
+        rollup = pd.DataFrame(0.0, index=zone_index, columns=list(values))
+        for name, array in values.items():
+            subset = points if category_column is None else points[points[category_column] == name]
+            weights, subset_zones = self.zone_weights(subset, zone_column)
+            rollup.loc[subset_zones, name] = weights.T @ np.asarray(array).ravel()
+        return rollup
+
+
+def _layer_geometry(layer, crs):
+    """Geometry of a GeoDataFrame or GeoDataHandler in crs"""
+    if isinstance(layer, GeoDataHandler):
+        return layer.geometry_in(crs)
+    geometry = layer.geometry
+    if geometry.crs is not None and not geometry.crs.equals(CRS.from_user_input(crs)):
+        geometry = geometry.to_crs(crs)
+    return geometry